@@ -0,0 +1,126 @@
+import pandas as pd
+import requests
+
+from codigo_barras import cb_valido, normalizar_cb
+from varejo_facil import atualiza, em_paralelo, obter_custos, obter_id
+
+COLUNAS_MODELO = ["CODIGO BARRA", "PRODUTOID", "VALOR", "TIPO"]
+TIPOS = {"VENDA": "Venda", "CUSTO": "Custo"}
+MAX_CONCORRENCIA = 8
+MAX_POR_SEGUNDO = 10
+
+
+# ========================= PREPARAÇÃO =========================
+def preparar_lote(df_up):
+    """Valida a planilha de atualização em lote.
+
+    Cada linha precisa de CODIGO BARRA (GTIN válido) ou PRODUTOID, um
+    VALOR numérico (aceita vírgula decimal) e TIPO Venda/Custo. Retorna
+    ``(itens, invalidas)``: a lista de itens prontos para
+    ``executar_lote`` e um DataFrame com as linhas rejeitadas e o motivo.
+    """
+    # LINHA vem de planilhas.ler_upload; sem ela, conta a partir da linha 2
+    linhas = df_up["LINHA"].to_numpy() if "LINHA" in df_up.columns else range(2, len(df_up) + 2)
+    df_up = df_up.reindex(columns=COLUNAS_MODELO, fill_value="").fillna("").astype(str)
+    df_up = df_up.apply(lambda col: col.str.strip())
+    df_up["CODIGO BARRA"] = normalizar_cb(df_up["CODIGO BARRA"]).to_numpy()
+    df_up.index = pd.Index(linhas, name="LINHA")
+
+    valor = pd.to_numeric(df_up["VALOR"].str.replace(",", ".", regex=False), errors="coerce")
+    tipo = df_up["TIPO"].str.upper().map(TIPOS)
+    pid = pd.to_numeric(df_up["PRODUTOID"], errors="coerce")
+    tem_cb = df_up["CODIGO BARRA"] != ""
+    tem_pid = pid.notna() & (pid % 1 == 0)
+
+    motivo = pd.Series("", index=df_up.index)
+    motivo.loc[~(tem_cb | tem_pid)] = "Sem CODIGO BARRA ou PRODUTOID válido"
+    motivo.loc[(motivo == "") & tem_cb & ~cb_valido(df_up["CODIGO BARRA"])] = "CODIGO BARRA inválido (dígito verificador)"
+    motivo.loc[(motivo == "") & ~(valor.notna() & (valor >= 0))] = "VALOR inválido"
+    motivo.loc[(motivo == "") & tipo.isna()] = "TIPO deve ser Venda ou Custo"
+
+    validas = motivo == ""
+    itens = [
+        {
+            "LINHA": linha,
+            "CODIGO BARRA": cb if cb else None,
+            "PRODUTOID": None if cb else int(p),
+            "VALOR": float(v),
+            "TIPO": t,
+        }
+        for linha, cb, p, v, t in zip(
+            df_up.index[validas], df_up["CODIGO BARRA"][validas],
+            pid[validas], valor[validas], tipo[validas],
+        )
+    ]
+    invalidas = df_up[~validas].assign(MOTIVO=motivo[~validas]).reset_index()
+    return itens, invalidas
+
+
+# ========================= EXECUÇÃO =========================
+def atualizar_item(item, cliente, registro=None):
+    """obter_id → obter_custos → atualiza para um item; nunca levanta exceção."""
+    res = {
+        "LINHA": item["LINHA"],
+        "CODIGO BARRA": item["CODIGO BARRA"] or "",
+        "PRODUTOID": item["PRODUTOID"],
+        "DESCRICAO": "",
+        "TIPO": item["TIPO"],
+        "VALOR": item["VALOR"],
+        "STATUS": "ERRO",
+        "LOJAS OK": "",
+        "LOJAS COM FALHA": "",
+        "DETALHE": "",
+    }
+    try:
+        if item["CODIGO BARRA"]:
+            pid, desc = obter_id(item["CODIGO BARRA"], cliente)
+            if not pid:
+                res["DETALHE"] = "Produto não encontrado"
+                return res
+            res.update(PRODUTOID=pid, DESCRICAO=desc or "")
+
+        custos = obter_custos(res["PRODUTOID"], cliente, usar_cache=False)
+        if not custos:
+            res["DETALHE"] = "Não foi possível obter preços"
+            return res
+
+        resultados = atualiza(custos, item["VALOR"], item["TIPO"], cliente, registro=registro)
+    except requests.RequestException as e:
+        res["DETALHE"] = str(e)
+        return res
+
+    ok = [r for r in resultados if r["ok"]]
+    falhas = [r for r in resultados if not r["ok"]]
+    res["LOJAS OK"] = ", ".join(str(r["lojaId"]) for r in ok)
+    res["LOJAS COM FALHA"] = ", ".join(f"{r['lojaId']} ({r['status']})" for r in falhas)
+    if not resultados:
+        res["DETALHE"] = "Nenhuma loja cadastrada para o produto"
+    elif falhas:
+        res["STATUS"] = "PARCIAL" if ok else "ERRO"
+        res["DETALHE"] = "; ".join(r["erro"] for r in falhas if r["erro"])
+    else:
+        res["STATUS"] = "OK"
+    return res
+
+
+def _atualizar_e_registrar(item, cliente, diario, job_id):
+    if diario is None:
+        return atualizar_item(item, cliente)
+    res = atualizar_item(item, cliente, diario.registro(job_id, item["LINHA"]))
+    diario.registrar_item(job_id, res)
+    return res
+
+
+def executar_lote(itens, cliente, max_concorrencia=MAX_CONCORRENCIA, max_por_segundo=MAX_POR_SEGUNDO,
+                  diario=None, job_id=None):
+    """Processa os itens em paralelo e devolve cada resultado assim que fica pronto.
+
+    Até ``max_concorrencia`` produtos ficam em andamento ao mesmo tempo,
+    cada um numa etapa diferente da cadeia, e todas as chamadas à API
+    respeitam o limite de ``max_por_segundo`` requisições por segundo.
+    Com ``diario``/``job_id``, cada escrita e cada resultado vão para o
+    diário, e o job pode ser retomado com ``diario.itens_pendentes``.
+    """
+    cliente = cliente.com_limite(max_por_segundo)
+    yield from em_paralelo(lambda item: _atualizar_e_registrar(item, cliente, diario, job_id), itens,
+                           max_concorrencia)
@@ -0,0 +1,121 @@
+"""Servidor local que imita os endpoints do Varejo Fácil usados pelo app."""
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LOJAS_SIMULADAS = [1, 2, 3, 5]
+
+
+def _id_produto(codigo):
+    return zlib.crc32(codigo.encode()) % 900_000 + 100_000
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como a API real
+    # Cabeçalhos e corpo saem numa única escrita (o servidor faz o flush ao
+    # fim de cada requisição) e sem Nagle: com escritas separadas, o ACK
+    # atrasado somava ~40 ms a cada requisição numa conexão reaproveitada.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status, corpo):
+        dados = json.dumps(corpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _atender(self):
+        self.server.contar(self.command, self.path)
+        time.sleep(self.server.latencia)
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if tamanho:
+            self.rfile.read(tamanho)
+
+        falha = self.server.proxima_falha(self.command, self.path)
+        if falha:
+            return self._responder(falha, {"erro": "falha simulada"})
+        if self.command == "POST" and self.path == "/api/auth":
+            return self._responder(200, {"accessToken": self.server.token})
+        token = self.headers.get("Authorization")
+        if token and token != self.server.token:
+            return self._responder(401, {"erro": "token expirado"})
+        m = re.fullmatch(r"/api/v1/produto/produtos/consulta/(\d+)", self.path)
+        if m:
+            return self._responder(200, {"id": _id_produto(m[1]), "descricao": f"PRODUTO {m[1]}"})
+        m = re.fullmatch(r"/api/v1/produto/produtos/(\d+)/precos", self.path)
+        if m:
+            pid = int(m[1])
+            return self._responder(200, [
+                {"id": pid * 10 + loja, "lojaId": loja, "produtoId": pid, "precoVenda1": 19.9,
+                 "custoProduto": 9.5, "precoMedioDeReposicao": 9.5, "precoFiscalDeReposicao": 9.5}
+                for loja in LOJAS_SIMULADAS
+            ])
+        if self.command == "PUT" and re.fullmatch(r"/api/v1/produto/(precos|custos)/\d+", self.path):
+            return self._responder(200, {})
+        self._responder(404, {"erro": "não encontrado"})
+
+    do_GET = do_PUT = do_POST = _atender
+
+
+class ApiSimulada(ThreadingHTTPServer):
+    """``with ApiSimulada(latencia=0.05) as api:`` sobe o servidor em ``api.url``.
+
+    Cada requisição espera ``latencia`` segundos antes de responder;
+    ``requisicoes`` conta as chamadas por método HTTP e ``historico``
+    guarda ``(método, caminho)`` de cada uma. ``falhar`` e
+    ``expirar_token`` simulam erros da API real nos testes.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latencia=0.05):
+        super().__init__(("127.0.0.1", 0), _Manipulador)
+        self.latencia = latencia
+        self.requisicoes = {}
+        self.historico = []
+        self.token = "token-simulado-0"
+        self._falhas = []
+        self._trava = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def contar(self, metodo, caminho):
+        with self._trava:
+            self.requisicoes[metodo] = self.requisicoes.get(metodo, 0) + 1
+            self.historico.append((metodo, caminho))
+
+    def falhar(self, status, metodo=None, caminho=r".*", vezes=1):
+        """As próximas ``vezes`` requisições que casarem com ``metodo``/``caminho`` recebem ``status``."""
+        with self._trava:
+            self._falhas += [(metodo, re.compile(caminho), status)] * vezes
+
+    def proxima_falha(self, metodo, caminho):
+        with self._trava:
+            for i, (m, padrao, status) in enumerate(self._falhas):
+                if m in (None, metodo) and padrao.fullmatch(caminho):
+                    del self._falhas[i]
+                    return status
+        return None
+
+    def expirar_token(self):
+        """Troca o token válido: quem usar o anterior passa a receber 401."""
+        with self._trava:
+            self.token = f"token-simulado-{int(self.token.rsplit('-', 1)[1]) + 1}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
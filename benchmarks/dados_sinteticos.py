@@ -0,0 +1,59 @@
+"""Catálogos e planilhas sintéticos com o formato do cad_concatenado.csv."""
+import numpy as np
+import pandas as pd
+
+PALAVRAS = (
+    "CANECA PORCELANA VIDRO PRATO TALHER GARFO FACA COLHER PANELA FRIGIDEIRA ALUMINIO INOX "
+    "POTE TAMPA HERMETICO COPO TACA JARRA GARRAFA TERMICA TOALHA BANHO ROSTO TAPETE CORTINA "
+    "ALMOFADA CAPA LENCOL FRONHA CESTO ORGANIZADOR CAIXA PLASTICO MADEIRA BAMBU VELA AROMATICA "
+    "DIFUSOR VASO FLOR ARTIFICIAL PORTA RETRATO QUADRO ESPELHO RELOGIO PAREDE LUMINARIA LED "
+    "BRINQUEDO PELUCIA BONECA CARRINHO QUEBRA CABECA ESCOLAR CADERNO LAPIS CANETA MOCHILA ESTOJO"
+).split()
+CORES = "BRANCO PRETO AZUL VERDE ROSA AMARELO VERMELHO CINZA BEGE LILAS".split()
+MEDIDAS = "100ML 250ML 350ML 500ML 1L 2L 10CM 20CM 30CM 40X60 P M G GG".split()
+
+
+def ean13(corpos):
+    """Completa corpos de 12 dígitos (int64) com o dígito verificador."""
+    digitos = (corpos[:, None] // 10 ** np.arange(11, -1, -1)) % 10
+    soma = digitos @ np.array([1, 3] * 6)
+    return corpos * 10 + (10 - soma % 10) % 10
+
+
+def gerar_catalogo(linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    qtd_fornecedores = int(np.clip(linhas // 500, 20, 2000))
+    fornecedores = np.array([f"FORNECEDOR {i:04d}" for i in range(qtd_fornecedores)], dtype=object)
+    # Poucos fornecedores grandes e muitos pequenos, como no catálogo real
+    pesos = 1 / np.arange(1, qtd_fornecedores + 1)
+    forn = rng.choice(qtd_fornecedores, size=linhas, p=pesos / pesos.sum())
+
+    corpos = 789_000_000_000 + rng.choice(1_000_000_000, size=linhas, replace=False)
+    descricao = pd.Series(np.array(PALAVRAS, dtype=object)[rng.integers(len(PALAVRAS), size=linhas)])
+    for lista in (PALAVRAS, CORES, MEDIDAS):
+        descricao = descricao + " " + np.array(lista, dtype=object)[rng.integers(len(lista), size=linhas)]
+
+    return pd.DataFrame({
+        "CODIGO BARRA": ean13(corpos).astype(str),
+        "CODIGO": pd.Series(rng.integers(1, 10 ** 6, size=linhas)).map("REF{:06d}".format),
+        "FORNECEDOR": fornecedores[forn],
+        "DESCRICAO": descricao,
+        "SITUACAO": np.where(rng.random(linhas) < 0.9, "ATIVO", "INATIVO"),
+        "__ORIGEM_PLANILHA__": pd.Series(fornecedores[forn]).str.replace(" ", "_") + ".xlsx",
+    })
+
+
+def gerar_upload(catalogo, linhas, semente=0, desconhecidos=0.05, qtd_invalidas=0.02):
+    """Planilha de lote (CODIGO BARRA, CODIGO, QTD) sorteada do catálogo.
+
+    Uma fração dos códigos não existe no catálogo e outra tem QTD
+    inválida, para exercitar os caminhos de rejeição.
+    """
+    rng = np.random.default_rng(semente + 1)
+    amostra = catalogo.iloc[rng.integers(len(catalogo), size=linhas)]
+    codigos = amostra["CODIGO BARRA"].to_numpy(dtype=object).copy()
+    falsos = rng.random(linhas) < desconhecidos
+    codigos[falsos] = ean13(100_000_000_000 + rng.integers(10 ** 9, size=int(falsos.sum()))).astype(str)
+    qtd = rng.integers(1, 25, size=linhas).astype(object)
+    qtd[rng.random(linhas) < qtd_invalidas] = ""
+    return pd.DataFrame({"CODIGO BARRA": codigos, "CODIGO": amostra["CODIGO"].to_numpy(), "QTD": qtd})
@@ -0,0 +1,326 @@
+"""Benchmarks da inicialização, do catálogo (em memória e SQLite), dos uploads, das planilhas e do fluxo da API.
+
+Uso, a partir da raiz do repositório::
+
+    python -m benchmarks.executar
+    python -m benchmarks.executar --tamanhos 10000 100000 --latencia-ms 20
+
+Cada tamanho de catálogo roda num processo separado, com o snapshot e os
+caches do Streamlit vazios. A primeira execução e os reruns do app são
+medidos com ``streamlit.testing``, sobre o primeiro catálogo. O fluxo obter_id/obter_custos/atualiza roda
+contra ``api_simulada`` com a latência escolhida. Os tempos vão para
+``benchmarks/resultados/<data>.json``, para comparar execuções.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime as dt
+from importlib import metadata
+from pathlib import Path
+
+PASTA = Path(__file__).resolve().parent
+RAIZ = PASTA.parent
+TAMANHOS = [10_000, 100_000, 1_000_000]
+PACOTES = ["pandas", "numpy", "pyarrow", "openpyxl", "requests", "streamlit"]
+# Importados pelo app antes de abrir uma página, e as páginas em si
+MODULOS_INICIALIZACAO = ["streamlit", "metricas", "paginas.trocas", "paginas.pedidos", "paginas.transferencias",
+                         "paginas.pesquisa", "paginas.precos", "paginas.fornecedor", "paginas.painel_metricas"]
+# Páginas visitadas por medir_app, nesta ordem, depois da primeira execução (que abre Trocas)
+PAGINAS_APP = ["🛠️ Atualizador de Preços", "🔎 Procura de Fornecedor", "♻️ Processo de Trocas"]
+
+
+def cronometrar(func, *args, repeticoes=1, **kwargs):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func(*args, **kwargs)
+        tempos.append(time.perf_counter() - inicio)
+    return resultado, {"mediana_s": statistics.median(tempos), "min_s": min(tempos), "repeticoes": repeticoes}
+
+
+def por_chamada(func, argumentos):
+    """Tempo médio (µs) de ``func`` sobre cada item de ``argumentos``."""
+    inicio = time.perf_counter()
+    for arg in argumentos:
+        func(arg)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+# ========================= CATÁLOGO E PLANILHAS =========================
+def medir_catalogo(linhas, pasta, semente):
+    import numpy as np
+    import pandas as pd
+
+    from benchmarks.dados_sinteticos import PALAVRAS, gerar_catalogo, gerar_upload
+
+    csv = pasta / f"catalogo_{linhas}.csv"
+    if not csv.exists():
+        gerar_catalogo(linhas, semente).to_csv(csv, index=False)
+
+    # MIMI_CATALOGO_URL / MIMI_CACHE_DIR já apontam para o CSV sintético
+    import catalogo
+    from conferencia import conciliar
+    from planilhas import exportar_xlsx, gerar_formulario_trocas, ler_upload
+
+    res = {"linhas": linhas}
+    _, res["snapshot_frio"] = cronometrar(catalogo.atualizar_snapshot, forcar=True)
+    _, res["snapshot_sem_mudanca"] = cronometrar(catalogo.atualizar_snapshot, forcar=True, repeticoes=5)
+    df, res["carga_catalogo"] = cronometrar(catalogo.carregar_csv_combinado)
+    _, res["carga_catalogo_em_cache"] = cronometrar(catalogo.carregar_csv_combinado, repeticoes=20)
+
+    # Comparação de dtypes: CSV como objetos Python x snapshot Arrow/Categorical.
+    # dtype=object, e não str: no pandas 3, dtype=str já vira string Arrow, e a
+    # base da comparação deixaria de ser a carga antiga (colunas de objetos).
+    df_objetos = pd.read_csv(csv, dtype=object).fillna("")
+    fornecedor = df["FORNECEDOR"].iloc[len(df) // 2]
+    res["memoria"] = {
+        "objetos_bytes": int(df_objetos.memory_usage(deep=True).sum()),
+        "snapshot_bytes": int(df.memory_usage(deep=True).sum()),
+    }
+    res["memoria"]["reducao"] = round(1 - res["memoria"]["snapshot_bytes"] / res["memoria"]["objetos_bytes"], 3)
+    _, res["filtro_fornecedor_objetos"] = cronometrar(
+        lambda: df_objetos[df_objetos["FORNECEDOR"] == fornecedor], repeticoes=10)
+    _, res["filtro_fornecedor_categoria"] = cronometrar(lambda: df[df["FORNECEDOR"] == fornecedor], repeticoes=10)
+    del df_objetos
+
+    indice, res["indice_codigos"] = cronometrar(catalogo.carregar_indice_catalogo)
+    _, res["indice_texto"] = cronometrar(catalogo.carregar_indice_texto)
+    _, res["fatia_fornecedor"] = cronometrar(indice.fatia, df, fornecedor, repeticoes=100)
+    memoria = catalogo.CatalogoMemoria(df, indice)
+
+    rng = np.random.default_rng(semente)
+    amostra = df["CODIGO BARRA"].iloc[rng.integers(len(df), size=1000)].tolist()
+    res["busca_unitaria_us"] = por_chamada(lambda c: memoria.produto(c, "CODIGO BARRA"), amostra)
+    res["busca_unitaria_fornecedor_us"] = por_chamada(
+        lambda c: memoria.produto(c, "CODIGO BARRA", fornecedor=fornecedor), amostra)
+    consultas = [" ".join(rng.choice(PALAVRAS, size=2)) for _ in range(20)]
+    res["busca_descricao_ms"] = por_chamada(lambda q: catalogo.buscar_por_descricao(df, q), consultas) / 1000
+
+    # Upload de lote: 10% do catálogo, gravado e relido como .xlsx
+    linhas_upload = max(1_000, linhas // 10)
+    upload = gerar_upload(df, linhas_upload, semente)
+    res["linhas_upload"] = linhas_upload
+    buf, res["exportacao_xlsx"] = cronometrar(exportar_xlsx, upload, "Lote")
+    arquivo_upload = pasta / f"upload_{linhas_upload}.xlsx"
+    arquivo_upload.write_bytes(buf.getvalue())
+
+    def ler():
+        with open(arquivo_upload, "rb") as f:
+            return list(ler_upload(f, ["CODIGO BARRA", "QTD"], ["CODIGO"], tamanho_max=float("inf")))
+
+    def resolver():
+        with open(arquivo_upload, "rb") as f:
+            partes = [catalogo.resolver_lote(lote, "CODIGO BARRA", memoria)
+                      for lote in ler_upload(f, ["CODIGO BARRA", "QTD"], ["CODIGO"], tamanho_max=float("inf"))]
+        return pd.concat([p[0] for p in partes], ignore_index=True)
+
+    _, res["leitura_upload"] = cronometrar(ler)
+    encontrados, res["resolucao_upload"] = cronometrar(resolver)
+    _, res["resolucao_em_memoria"] = cronometrar(catalogo.resolver_lote, upload, "CODIGO BARRA", memoria)
+
+    itens = encontrados.head(5_000).rename(columns={"QTD": "QUANTIDADE"})
+    _, res["formulario_trocas"] = cronometrar(gerar_formulario_trocas, itens)
+    res["formulario_trocas"]["itens"] = len(itens)
+
+    enviado = encontrados.rename(columns={"QTD": "ENVIADO"})
+    recebido = enviado.sample(frac=0.9, random_state=semente).rename(columns={"ENVIADO": "RECEBIDO"})
+    recebido["RECEBIDO"] = recebido["RECEBIDO"] + rng.integers(-1, 2, size=len(recebido))
+    _, res["conciliacao"] = cronometrar(conciliar, enviado, recebido, memoria)
+
+    # Mesmas consultas no banco SQLite (MIMI_CATALOGO_BACKEND=sqlite)
+    from catalogo_sqlite import CatalogoSQLite
+
+    sqlite, res["sqlite_montagem"] = cronometrar(CatalogoSQLite, catalogo.atualizar_snapshot())
+    res["sqlite_bytes"] = sqlite.arquivo.stat().st_size
+    res["sqlite_busca_unitaria_us"] = por_chamada(lambda c: sqlite.produto(c, "CODIGO BARRA"), amostra)
+    res["sqlite_busca_unitaria_fornecedor_us"] = por_chamada(
+        lambda c: sqlite.produto(c, "CODIGO BARRA", fornecedor=fornecedor), amostra)
+    _, res["sqlite_sugestoes"] = cronometrar(sqlite.sugestoes, fornecedor, "CODIGO BARRA", "789", repeticoes=100)
+    _, res["sqlite_origens"] = cronometrar(sqlite.origens, [fornecedor], repeticoes=100)
+    _, res["sqlite_resolucao_em_memoria"] = cronometrar(catalogo.resolver_lote, upload, "CODIGO BARRA", sqlite)
+    _, res["sqlite_conciliacao"] = cronometrar(conciliar, enviado, recebido, sqlite)
+    return res
+
+
+# ========================= API =========================
+def medir_api(latencia, produtos, semente):
+    import numpy as np
+
+    from benchmarks.api_simulada import ApiSimulada
+    from benchmarks.dados_sinteticos import ean13
+
+    rng = np.random.default_rng(semente)
+    # Um conjunto de códigos por etapa, para nenhuma aproveitar o cache da outra
+    etapas = ean13(789_000_000_000 + rng.choice(10 ** 9, size=3 * produtos, replace=False)).astype(str)
+    sequencial, paralelo, lote = etapas[:produtos], etapas[produtos:2 * produtos], etapas[2 * produtos:]
+
+    with ApiSimulada(latencia) as api:
+        os.environ["VAREJO_FACIL_URL"] = api.url
+        import varejo_facil as vf
+        from atualizacao_lote import executar_lote
+
+        cliente = vf.login("benchmark", "benchmark")
+        res = {"latencia_ms": latencia * 1000, "produtos": produtos}
+
+        def consultar(codigos):
+            for cb in codigos:
+                pid, _ = vf.obter_id(cb, cliente)
+                vf.obter_custos(pid, cliente)
+
+        _, res["consulta_sequencial"] = cronometrar(consultar, sequencial)
+        _, res["consulta_sequencial_em_cache"] = cronometrar(consultar, sequencial)
+        _, res["consulta_em_lote"] = cronometrar(lambda: list(vf.consultar_em_lote(paralelo, cliente)))
+
+        custos = vf.obter_custos(vf.obter_id(sequencial[0], cliente)[0], cliente)
+        _, res["atualiza_um_produto"] = cronometrar(vf.atualiza, custos, 10.0, "Venda", cliente, repeticoes=5)
+
+        itens = [{"LINHA": i + 2, "CODIGO BARRA": cb, "PRODUTOID": None, "VALOR": 10.0, "TIPO": "Venda"}
+                 for i, cb in enumerate(lote)]
+        # Sem limite de requisições/s: mede o fluxo, não o limitador
+        _, res["atualizacao_em_lote"] = cronometrar(
+            lambda: list(executar_lote(itens, cliente, max_por_segundo=10_000)))
+        res["requisicoes"] = dict(api.requisicoes)
+        res["cache"] = vf.estatisticas_cache()
+    return res
+
+
+# ========================= INICIALIZAÇÃO =========================
+def medir_inicializacao(repeticoes=3):
+    """Tempo de importação a frio (processo novo) de cada módulo carregado pelo app."""
+    res = {}
+    for modulo in MODULOS_INICIALIZACAO:
+        codigo = f"import time; t = time.perf_counter(); import {modulo}; print(time.perf_counter() - t)"
+        tempos = [
+            float(subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True,
+                                 capture_output=True, text=True).stdout.split()[-1])
+            for _ in range(repeticoes)
+        ]
+        res[modulo] = {"mediana_s": statistics.median(tempos), "min_s": min(tempos), "repeticoes": repeticoes}
+    return res
+
+
+# Roda num processo novo, com cwd na raiz do app; o import do streamlit fica fora da medição
+_CODIGO_APP = """
+import json, statistics, sys, time
+from streamlit.testing.v1 import AppTest
+
+def rodar(app):
+    inicio = time.perf_counter()
+    app.run()
+    assert not app.exception, app.exception
+    return time.perf_counter() - inicio
+
+app = AppTest.from_file("teste_apps_unificados.py", default_timeout=600)
+res = {"primeira_execucao_s": rodar(app), "paginas": {}}
+for pagina in json.loads(sys.argv[1]):
+    app.sidebar.radio[0].set_value(pagina)
+    primeira = rodar(app)
+    reruns = [rodar(app) for _ in range(int(sys.argv[2]))]
+    res["paginas"][pagina] = {"primeira_visita_s": primeira, "rerun_mediana_s": statistics.median(reruns),
+                              "rerun_min_s": min(reruns)}
+print(json.dumps(res))
+"""
+
+
+def medir_app(env, raiz=RAIZ, repeticoes=10):
+    """Primeira execução do app num processo novo e, em cada página, a primeira visita e os reruns.
+
+    Usa o ``AppTest`` do Streamlit, que executa o script como o servidor
+    faria. ``raiz`` permite medir outra cópia do repositório (ex.: um
+    ``git worktree`` de uma versão anterior) com o mesmo roteiro.
+    """
+    saida = subprocess.run([sys.executable, "-c", _CODIGO_APP, json.dumps(PAGINAS_APP), str(repeticoes)],
+                           cwd=raiz, env={**env, "PYTHONPATH": str(raiz)}, check=True,
+                           capture_output=True, text=True).stdout
+    return json.loads(saida.splitlines()[-1])
+
+
+# ========================= EXECUÇÃO =========================
+def _rodar_filho(argumentos, env):
+    with tempfile.TemporaryDirectory() as tmp:
+        saida = Path(tmp) / "resultado.json"
+        subprocess.run([sys.executable, "-m", "benchmarks.executar", *argumentos, "--saida-filho", str(saida)],
+                       cwd=RAIZ, env=env, check=True)
+        return json.loads(saida.read_text(encoding="utf-8"))
+
+
+def _versao(pacote):
+    try:
+        return metadata.version(pacote)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS, help="linhas do catálogo sintético")
+    parser.add_argument("--latencia-ms", type=float, default=50, help="latência da API simulada")
+    parser.add_argument("--produtos", type=int, default=200, help="produtos por etapa do fluxo da API")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--dados", type=Path, default=PASTA / "dados", help="pasta dos arquivos gerados")
+    parser.add_argument("--saida", type=Path, help="arquivo JSON de resultado")
+    parser.add_argument("--sem-api", action="store_true", help="não roda o fluxo da API")
+    parser.add_argument("--filho-catalogo", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--filho-api", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--saida-filho", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho_catalogo or args.filho_api:
+        if args.filho_catalogo:
+            res = medir_catalogo(args.filho_catalogo, args.dados, args.semente)
+        else:
+            res = medir_api(args.latencia_ms / 1000, args.produtos, args.semente)
+        args.saida_filho.write_text(json.dumps(res, indent=2), encoding="utf-8")
+        return
+
+    args.dados.mkdir(parents=True, exist_ok=True)
+    comuns = ["--dados", str(args.dados.resolve()), "--semente", str(args.semente)]
+    resultado = {
+        "data": dt.now().astimezone().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versoes": {p: _versao(p) for p in PACOTES},
+        "parametros": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()
+                       if not k.startswith(("filho", "saida_filho"))},
+        "inicializacao": None,
+        "app": None,
+        "catalogo": [],
+        "api": None,
+    }
+    print("Inicialização das páginas...", flush=True)
+    resultado["inicializacao"] = medir_inicializacao()
+    for linhas in args.tamanhos:
+        print(f"Catálogo com {linhas} linhas...", flush=True)
+        cache = args.dados.resolve() / f"cache_{linhas}"
+        shutil.rmtree(cache, ignore_errors=True)
+        env = {**os.environ,
+               "MIMI_CATALOGO_URL": (args.dados.resolve() / f"catalogo_{linhas}.csv").as_uri(),
+               "MIMI_CACHE_DIR": str(cache)}
+        resultado["catalogo"].append(_rodar_filho(["--filho-catalogo", str(linhas), *comuns], env))
+        if resultado["app"] is None:
+            # Com o snapshot do menor catálogo já gravado, como num servidor reiniciado
+            print("Primeira execução e reruns do app...", flush=True)
+            resultado["app"] = {"linhas_catalogo": linhas, **medir_app(env)}
+
+    if not args.sem_api:
+        print(f"Fluxo da API ({args.latencia_ms} ms de latência)...", flush=True)
+        resultado["api"] = _rodar_filho(
+            ["--filho-api", "--latencia-ms", str(args.latencia_ms), "--produtos", str(args.produtos), *comuns],
+            dict(os.environ))
+
+    saida = args.saida or PASTA / "resultados" / f"{dt.now():%Y%m%d-%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados gravados em {saida}")
+
+
+if __name__ == "__main__":
+    main()
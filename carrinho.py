@@ -0,0 +1,100 @@
+import pandas as pd
+
+CHAVE = ("FORNECEDOR", "CODIGO BARRA")
+# Identifica o item quando o CODIGO BARRA está vazio (produto buscado por REF)
+CHAVE_ALTERNATIVA = "CODIGO"
+
+
+class Carrinho:
+    """Itens de trocas/pedidos indexados por (FORNECEDOR, CODIGO BARRA).
+
+    Itens sem código de barras são indexados pelo CODIGO (REF) no lugar,
+    para que produtos diferentes do mesmo fornecedor não virem uma linha só.
+    Cada SKU ocupa uma única linha: adicionar de novo soma a quantidade.
+    As linhas ficam num dicionário (ordem de inclusão), então incluir,
+    alterar ou remover um item é O(1). ``df()`` devolve a visão em
+    DataFrame, montada só quando o carrinho muda desde a última chamada.
+    """
+
+    def __init__(self, colunas, coluna_qtd):
+        self.colunas = list(colunas)
+        self.coluna_qtd = coluna_qtd
+        self._i_qtd = self.colunas.index(coluna_qtd)
+        self._i_chave = [self.colunas.index(c) for c in CHAVE]
+        self._i_alternativa = self.colunas.index(CHAVE_ALTERNATIVA) if CHAVE_ALTERNATIVA in self.colunas else None
+        self._linhas = {}
+        self.versao = 0
+        self._visao = (None, None)
+
+    def __len__(self):
+        return len(self._linhas)
+
+    def _chave(self, linha):
+        fornecedor, cb = (linha[i] for i in self._i_chave)
+        if cb == "" and self._i_alternativa is not None:
+            return fornecedor, "", linha[self._i_alternativa]
+        return fornecedor, cb
+
+    def _somar(self, linha):
+        atual = self._linhas.get(self._chave(linha))
+        if atual is None:
+            self._linhas[self._chave(linha)] = linha
+        else:
+            atual[self._i_qtd] += linha[self._i_qtd]
+
+    def adicionar(self, item):
+        self._somar([item.get(c, "") for c in self.colunas])
+        self.versao += 1
+
+    def adicionar_df(self, df):
+        """Inclui todas as linhas de ``df`` (SKUs repetidos no próprio lote já chegam somados)."""
+        if df.empty:
+            return
+        df = df.reindex(columns=self.colunas, fill_value="")
+        grupos = [df[c] for c in CHAVE]
+        if self._i_alternativa is not None:
+            grupos.append(df[CHAVE_ALTERNATIVA].where(df["CODIGO BARRA"] == "", "").rename("_ALTERNATIVA"))
+        agregacao = {c: "sum" if c == self.coluna_qtd else "first" for c in self.colunas if c not in CHAVE}
+        df = df.groupby(grupos, sort=False, observed=True, dropna=False).agg(agregacao).reset_index()
+        for linha in df[self.colunas].astype(object).to_numpy().tolist():
+            self._somar(linha)
+        self.versao += 1
+
+    def atualizar(self, chave, qtd):
+        """Define a quantidade do item; zero ou menos remove."""
+        if qtd <= 0:
+            self.remover(chave)
+        elif chave in self._linhas:
+            self._linhas[chave][self._i_qtd] = qtd
+            self.versao += 1
+
+    def remover(self, chave):
+        if self._linhas.pop(chave, None) is not None:
+            self.versao += 1
+
+    def remover_ultimo(self):
+        """Remove o último item incluído e o devolve como dicionário."""
+        _, linha = self._linhas.popitem()
+        self.versao += 1
+        return dict(zip(self.colunas, linha))
+
+    def limpar(self):
+        self._linhas.clear()
+        self.versao += 1
+
+    def df(self):
+        versao, df = self._visao
+        if versao != self.versao:
+            df = pd.DataFrame(list(self._linhas.values()), columns=self.colunas)
+            self._visao = (self.versao, df)
+        return df.copy(deep=False)
+
+    def aplicar_edicao(self, editado):
+        """Aplica as quantidades alteradas num ``st.data_editor`` de ``df()``; devolve quantas mudaram."""
+        atual = self.df()
+        qtd = pd.to_numeric(editado[self.coluna_qtd], errors="coerce").fillna(0).astype(int)
+        mudou = qtd.to_numpy() != atual[self.coluna_qtd].to_numpy()
+        chaves = [self._chave(linha) for linha in atual.loc[mudou, self.colunas].to_numpy().tolist()]
+        for chave, q in zip(chaves, qtd[mudou].tolist()):
+            self.atualizar(chave, q)
+        return int(mudou.sum())
@@ -0,0 +1,517 @@
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import streamlit as st
+
+from codigo_barras import limpar_codigos, limpar_texto, normalizar_cb, normalizar_codigo
+from metricas import METRICAS, cronometrado
+
+URL_CATALOGO = os.environ.get(
+    "MIMI_CATALOGO_URL",
+    "https://raw.githubusercontent.com/LojasMimi/transferencia_loja/refs/heads/main/cad_concatenado.csv",
+)
+PASTA_CACHE = Path(os.environ.get("MIMI_CACHE_DIR", ".cache_mimi"))
+TIMEOUT_DOWNLOAD = 15
+# "memoria" (padrão): DataFrame compartilhado + índices; "sqlite": banco indexado em disco (catalogo_sqlite.py)
+BACKEND_CATALOGO = os.environ.get("MIMI_CATALOGO_BACKEND", "memoria").strip().lower()
+# Intervalo mínimo (s) entre duas consultas ao GitHub para o mesmo snapshot
+INTERVALO_VERIFICACAO = 300
+# Incrementar quando mudar o formato gravado por normalizar_catalogo
+VERSAO_SNAPSHOT = 5
+COLUNAS_CHAVE = ("CODIGO BARRA", "CODIGO")
+# Tamanhos de código de barras completo (EAN-8, UPC-A, EAN-13, GTIN-14)
+TAMANHOS_GTIN = (8, 12, 13, 14)
+# Colunas de baixa cardinalidade guardadas como categoria (dicionário no Arrow)
+COLUNAS_CATEGORIA = ("FORNECEDOR", "__ORIGEM_PLANILHA__", "SITUACAO")
+
+# Cópias rasas do catálogo compartilhado só são seguras com Copy-on-Write,
+# que passou a ser o padrão no pandas 3.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+# ========================= CARGA DO CATÁLOGO =========================
+def normalizar_catalogo(df):
+    df = df.loc[:, ~df.columns.str.contains("^Unnamed", case=False)]
+    df.columns = df.columns.str.strip().str.upper()
+    def dedup_columns(cols):
+        seen = {}
+        new = []
+        for c in cols:
+            if c in seen:
+                seen[c] += 1
+                new.append(f"{c}_{seen[c]}")
+            else:
+                seen[c] = 0
+                new.append(c)
+        return new
+    df.columns = dedup_columns(df.columns)
+    if "SITUACAO" in df.columns:
+        df["SITUACAO"] = df["SITUACAO"].str.replace("ç", "c", regex=False)
+    if "DESCRIÇÃO" in df.columns:
+        df["DESCRIÇÃO"] = df["DESCRIÇÃO"].str.replace("ç", "c", regex=False)
+    for col in COLUNAS_CHAVE:
+        if col in df.columns:
+            df[col] = normalizar_chaves(df[col], col)
+    for col in COLUNAS_CATEGORIA:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    # Ordenado por fornecedor, cada fornecedor ocupa um intervalo contínuo
+    if "FORNECEDOR" in df.columns:
+        df = df.sort_values("FORNECEDOR", kind="stable")
+    return df.reset_index(drop=True)
+
+
+@cronometrado("catalogo.atualizar_snapshot")
+def atualizar_snapshot(url=URL_CATALOGO, pasta=PASTA_CACHE, forcar=False):
+    """Garante um snapshot local (Arrow/Feather) já normalizado do catálogo.
+
+    O CSV só é baixado e reprocessado quando o remoto muda (ETag /
+    Last-Modified). Se a origem estiver lenta ou fora do ar, o último
+    snapshot válido é usado. Aceita URLs http(s):// e file://. Com
+    ``forcar``, ignora o intervalo mínimo entre consultas.
+    """
+    arquivo = pasta / "cad_concatenado.arrow"
+    arquivo_meta = pasta / "cad_concatenado.meta.json"
+    meta = {}
+    if arquivo.exists() and arquivo_meta.exists():
+        meta = json.loads(arquivo_meta.read_text(encoding="utf-8"))
+        if (meta.get("url"), meta.get("versao")) != (url, VERSAO_SNAPSHOT):
+            meta = {}
+        elif not forcar and time.time() - meta.get("verificado_em", 0) < INTERVALO_VERIFICACAO:
+            return arquivo
+
+    req = urllib.request.Request(url)
+    if meta.get("etag"):
+        req.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        req.add_header("If-Modified-Since", meta["last_modified"])
+
+    try:
+        with urllib.request.urlopen(req, timeout=TIMEOUT_DOWNLOAD) as resp:
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if meta and (etag or last_modified) and \
+                    (etag, last_modified) == (meta.get("etag"), meta.get("last_modified")):
+                conteudo = None  # servidor ignorou o cabeçalho condicional
+            else:
+                conteudo = resp.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and meta:
+            conteudo = None
+        elif arquivo.exists():
+            return arquivo
+        else:
+            raise
+    except (urllib.error.URLError, OSError):
+        if not arquivo.exists():
+            raise
+        return arquivo
+
+    METRICAS.contar("catalogo.download" if conteudo is not None else "catalogo.nao_modificado")
+    if conteudo is not None:
+        df = normalizar_catalogo(pd.read_csv(BytesIO(conteudo), dtype=str).fillna(""))
+        pasta.mkdir(parents=True, exist_ok=True)
+        temporario = pasta / f"cad_concatenado.{os.getpid()}.tmp"
+        feather.write_feather(df, temporario, compression="uncompressed")
+        os.replace(temporario, arquivo)
+        meta = {"url": url, "versao": VERSAO_SNAPSHOT, "etag": etag, "last_modified": last_modified}
+
+    meta["verificado_em"] = time.time()
+    arquivo_meta.write_text(json.dumps(meta), encoding="utf-8")
+    return arquivo
+
+
+def _tipo_pandas(tipo):
+    # Colunas de dicionário viram Categorical (filtros comparam códigos
+    # inteiros); o resto fica como string Arrow, sem objetos Python.
+    if pa.types.is_dictionary(tipo):
+        return None
+    return pd.ArrowDtype(tipo)
+
+
+@st.cache_resource(show_spinner=False)
+@cronometrado("catalogo.leitura_snapshot")
+def _catalogo_compartilhado():
+    # Snapshot sem compressão + memory_map: as colunas apontam direto para o
+    # arquivo mapeado, compartilhado entre sessões e entre processos.
+    tabela = feather.read_table(atualizar_snapshot(), memory_map=True)
+    df = tabela.to_pandas(types_mapper=_tipo_pandas)
+    if "FORNECEDOR" in df.columns and not df["FORNECEDOR"].is_monotonic_increasing:
+        # Snapshot antigo, gravado antes da ordenação por fornecedor
+        df = df.sort_values("FORNECEDOR", kind="stable").reset_index(drop=True)
+    METRICAS.contar("catalogo.linhas_carregadas", len(df))
+    return df
+
+
+@cronometrado("catalogo.carregar_csv_combinado")
+def carregar_csv_combinado():
+    """Retorna uma visão somente leitura do catálogo compartilhado.
+
+    A visão é uma cópia rasa: não duplica os dados, e com Copy-on-Write
+    qualquer alteração feita pelo chamador fica restrita à própria cópia.
+    """
+    return _catalogo_compartilhado().copy(deep=False)
+
+
+def recarregar_catalogo():
+    """Consulta a origem agora e descarta o catálogo e os índices em memória."""
+    atualizar_snapshot(forcar=True)
+    _catalogo_compartilhado.clear()
+    carregar_indice_catalogo.clear()
+    carregar_indice_texto.clear()
+    obter_catalogo.clear()
+
+
+# ========================= ÍNDICE DE CÓDIGOS =========================
+def normalizar_chaves(serie, coluna=None):
+    """Códigos na forma usada como chave: CODIGO BARRA canônico, demais só sem espaços."""
+    if coluna == "CODIGO BARRA":
+        return normalizar_cb(serie)
+    return limpar_texto(serie)
+
+
+def limpar_prefixo(prefixo, coluna):
+    """Prefixo digitado na busca de códigos, limpo como a coluna correspondente."""
+    limpar = limpar_codigos if coluna == "CODIGO BARRA" else limpar_texto
+    return limpar([prefixo]).iat[0]
+
+
+def codigo_completo(prefixo, coluna):
+    """Chave do código de barras digitado por inteiro, quando ela não começa com o próprio texto.
+
+    O catálogo guarda EAN-8 e UPC-A com zeros à esquerda (13 dígitos), então
+    ``12345670`` como prefixo não acha ``0000012345670``; as sugestões
+    incluem essa chave à parte. Retorna None nos demais casos.
+    """
+    if coluna != "CODIGO BARRA":
+        return None
+    texto = limpar_prefixo(prefixo, coluna)
+    if not (texto.isascii() and texto.isdigit() and len(texto) in TAMANHOS_GTIN):
+        return None
+    chave = normalizar_codigo(texto)
+    return chave if chave and not chave.startswith(texto) else None
+
+
+class IndiceCatalogo:
+    """Estruturas de consulta montadas uma única vez na carga do catálogo.
+
+    - ``geral`` / ``por_fornecedor``: dicionários código → posição da linha,
+      por coluna de código. Em códigos repetidos vale a primeira linha, como
+      no antigo ``resultado.iloc[0]``.
+    - ``fornecedores``: lista ordenada de fornecedores.
+    - ``faixas``: intervalo ``(inicio, fim)`` de linhas de cada fornecedor
+      (o catálogo vem ordenado por FORNECEDOR).
+    - ``ordenados``: códigos distintos e ordenados de cada fornecedor.
+    """
+
+    def __init__(self, df):
+        self.geral = {}
+        self.por_fornecedor = {}
+        self.ordenados = {}
+
+        valores = df["FORNECEDOR"].to_numpy(dtype=object) if "FORNECEDOR" in df.columns \
+            else np.full(len(df), "", dtype=object)
+        inicios = np.flatnonzero(np.r_[True, valores[1:] != valores[:-1]]) if len(df) else np.array([], dtype=int)
+        fins = np.r_[inicios[1:], len(df)]
+        self.faixas = {valores[i]: (int(i), int(f)) for i, f in zip(inicios, fins)}
+        self.fornecedores = sorted(self.faixas)
+
+        for coluna in COLUNAS_CHAVE:
+            if coluna not in df.columns:
+                continue
+            chaves = normalizar_chaves(df[coluna], coluna).to_numpy(dtype=object)
+
+            unicos, primeiros = np.unique(chaves, return_index=True)
+            self.geral[coluna] = dict(zip(unicos.tolist(), primeiros.tolist()))
+            self.geral[coluna].pop("", None)
+
+            self.por_fornecedor[coluna] = {}
+            self.ordenados[coluna] = {}
+            for forn, (inicio, fim) in self.faixas.items():
+                unicos, primeiros = np.unique(chaves[inicio:fim], return_index=True)
+                mapa = dict(zip(unicos.tolist(), (primeiros + inicio).tolist()))
+                if mapa.pop("", None) is not None:
+                    unicos = unicos[1:]  # "" é sempre o primeiro na ordem
+                self.por_fornecedor[coluna][forn] = mapa
+                self.ordenados[coluna][forn] = unicos
+
+    def fatia(self, df, fornecedor):
+        """Linhas do fornecedor como fatia contínua (sem cópia) de ``df``."""
+        inicio, fim = self.faixas.get(fornecedor, (0, 0))
+        return df.iloc[inicio:fim]
+
+    def codigos(self, fornecedor, coluna):
+        return self.ordenados.get(coluna, {}).get(fornecedor, np.array([], dtype=object))
+
+    @cronometrado("catalogo.sugestoes")
+    def sugestoes(self, df, fornecedor, coluna, prefixo, limite=20):
+        """Até ``limite`` códigos do fornecedor que começam com ``prefixo``.
+
+        Busca binária na lista ordenada de ``codigos``; retorna
+        ``([(codigo, descricao), ...], total_de_ocorrencias)``. Um código de
+        barras digitado por inteiro também acha a sua chave
+        (``codigo_completo``), que vem primeiro.
+        """
+        codigos = self.codigos(fornecedor, coluna)
+        mapa = self.mapa(coluna, fornecedor)
+        exato = codigo_completo(prefixo, coluna)
+        exato = [exato] if exato in mapa else []
+        prefixo = limpar_prefixo(prefixo, coluna)
+        inicio = int(np.searchsorted(codigos, prefixo, side="left"))
+        fim = int(np.searchsorted(codigos, prefixo + "\U0010ffff", side="left")) if prefixo else len(codigos)
+        achados = exato + codigos[inicio:min(fim, inicio + limite - len(exato))].tolist()
+        if "DESCRICAO" in df.columns:
+            descricoes = df["DESCRICAO"].iloc[[mapa[c] for c in achados]].tolist()
+        else:
+            descricoes = [""] * len(achados)
+        return list(zip(achados, descricoes)), fim - inicio + len(exato)
+
+    def mapa(self, coluna, fornecedor=None):
+        if fornecedor is None:
+            return self.geral.get(coluna, {})
+        return self.por_fornecedor.get(coluna, {}).get(fornecedor, {})
+
+    def localizar(self, codigo, coluna, fornecedor=None):
+        return self.mapa(coluna, fornecedor).get(normalizar_chaves([codigo], coluna).iat[0])
+
+
+@st.cache_resource(show_spinner=False)
+@cronometrado("catalogo.indice_codigos")
+def carregar_indice_catalogo():
+    return IndiceCatalogo(_catalogo_compartilhado())
+
+
+# ========================= API DE CONSULTA =========================
+class CatalogoMemoria:
+    """Consultas das telas sobre o catálogo em memória.
+
+    Mesma interface de ``catalogo_sqlite.CatalogoSQLite``: as telas pegam
+    uma das duas com ``obter_catalogo`` e não filtram o DataFrame direto.
+    """
+
+    def __init__(self, df, indice):
+        self.df = df
+        self.indice = indice
+        self.colunas = list(df.columns)
+        self.fornecedores = indice.fornecedores
+
+    @cronometrado("catalogo.produto")
+    def produto(self, codigo, coluna, fornecedor=None):
+        """Linha do catálogo (``pd.Series``) para o código, ou None."""
+        pos = self.indice.localizar(codigo, coluna, fornecedor)
+        return self.df.iloc[pos] if pos is not None else None
+
+    @cronometrado("catalogo.produtos")
+    def produtos(self, codigos, coluna, fornecedor=None, colunas=None):
+        """Consulta vários códigos de uma vez.
+
+        Retorna ``(achados, linhas)``: ``achados`` é uma máscara alinhada a
+        ``codigos`` e ``linhas`` traz, na mesma ordem, as linhas do catálogo
+        dos códigos achados (só as ``colunas`` pedidas, vazias se ausentes).
+        """
+        posicoes = normalizar_chaves(pd.Series(codigos, dtype=object), coluna).map(
+            self.indice.mapa(coluna, fornecedor))
+        achados = posicoes.notna().to_numpy()
+        linhas = self.df.iloc[posicoes[achados].astype(int).to_numpy()]
+        if colunas is not None:
+            linhas = linhas.reindex(columns=colunas, fill_value="")
+        return achados, linhas.reset_index(drop=True)
+
+    def sugestoes(self, fornecedor, coluna, prefixo, limite=20):
+        return self.indice.sugestoes(self.df, fornecedor, coluna, prefixo, limite)
+
+    @cronometrado("catalogo.origens")
+    def origens(self, fornecedores):
+        """Pares distintos FORNECEDOR / __ORIGEM_PLANILHA__ dos fornecedores dados."""
+        colunas = ["FORNECEDOR", "__ORIGEM_PLANILHA__"]
+        partes = [self.indice.fatia(self.df, f)[colunas] for f in fornecedores]
+        if not partes:
+            return pd.DataFrame(columns=colunas)
+        return pd.concat(partes).drop_duplicates().reset_index(drop=True)
+
+
+@st.cache_resource(show_spinner=False)
+@cronometrado("catalogo.obter_catalogo")
+def obter_catalogo():
+    """API de consulta do catálogo usada pelas telas, conforme ``MIMI_CATALOGO_BACKEND``.
+
+    Com ``sqlite``, as consultas vão a um banco indexado montado a partir
+    do snapshot, e o catálogo não é carregado inteiro em cada processo.
+    """
+    if BACKEND_CATALOGO == "sqlite":
+        from catalogo_sqlite import CatalogoSQLite
+        return CatalogoSQLite(atualizar_snapshot())
+    return CatalogoMemoria(_catalogo_compartilhado(), carregar_indice_catalogo())
+
+
+# ========================= RESOLUÇÃO EM LOTE =========================
+COLUNAS_LOTE = ["CODIGO BARRA", "CODIGO", "FORNECEDOR", "DESCRICAO", "__ORIGEM_PLANILHA__"]
+# Acima disso a QTD é erro de digitação (ex.: código de barras colado na coluna)
+MAX_QTD = 99_999
+
+
+@cronometrado("catalogo.resolver_lote")
+def resolver_lote(df_up, coluna, catalogo, fornecedor=None):
+    """Resolve uma planilha de lote inteira contra o ``catalogo`` (de ``obter_catalogo``).
+
+    Retorna ``(encontrados, desconhecidos, qtd_invalidas)``:
+    ``encontrados`` traz as colunas do catálogo em ``COLUNAS_LOTE`` mais a
+    ``QTD`` enviada (inteiro de 1 a ``MAX_QTD``); os outros dois são as
+    linhas rejeitadas do upload, com
+    a coluna ``LINHA`` indicando a linha correspondente no Excel (se o
+    upload não a trouxer, como os lotes de ``planilhas.ler_upload``, conta
+    a partir da linha 2).
+    """
+    df_up = df_up.reset_index(drop=True)
+    rejeitadas = df_up if "LINHA" in df_up.columns else df_up.assign(LINHA=df_up.index + 2)
+
+    if "QTD" in df_up.columns:
+        # Só inteiros escritos por extenso ("3" ou "3.0" do Excel); "1e20" ou "1.5" não
+        texto = df_up["QTD"].astype(str).str.strip()
+        qtd = pd.to_numeric(texto.where(texto.str.fullmatch(r"\d+(\.0*)?")), errors="coerce")
+    else:
+        qtd = pd.Series(float("nan"), index=df_up.index)
+    qtd_ok = (qtd.notna() & (qtd > 0) & (qtd <= MAX_QTD)).to_numpy()
+
+    codigos = df_up[coluna] if coluna in df_up.columns else pd.Series("", index=df_up.index)
+    no_catalogo, linhas = catalogo.produtos(codigos, coluna, fornecedor, COLUNAS_LOTE)
+
+    encontrados = linhas[qtd_ok[no_catalogo]].reset_index(drop=True)
+    encontrados["QTD"] = qtd[qtd_ok & no_catalogo].astype(int).to_numpy()
+
+    desconhecidos = rejeitadas[qtd_ok & ~no_catalogo]
+    qtd_invalidas = rejeitadas[~qtd_ok]
+    METRICAS.contar("lote.linhas_resolvidas", len(df_up))
+    return encontrados, desconhecidos, qtd_invalidas
+
+
+# ========================= BUSCA POR DESCRIÇÃO =========================
+def normalizar_texto(serie):
+    """Maiúsculas, sem acentos (inclui o ``ç``) e só letras/dígitos."""
+    return (
+        serie.astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.upper()
+        .str.replace(r"[^A-Z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _trigramas(token):
+    t = f" {token} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+class IndiceTexto:
+    """Índice invertido token → linhas sobre a coluna DESCRICAO.
+
+    As listas de linhas ficam num único array (formato CSR): as linhas do
+    token ``i`` do vocabulário são ``linhas[inicio[i]:inicio[i + 1]]``. O
+    vocabulário ordenado permite casar prefixos com busca binária, e um
+    índice de trigramas sobre ele cobre erros de digitação.
+    """
+
+    PESO_EXATO = 1.0
+    PESO_PREFIXO = 0.8
+    PESO_APROXIMADO = 0.6
+    SIMILARIDADE_MINIMA = 0.4
+
+    def __init__(self, df):
+        textos = normalizar_texto(df["DESCRICAO"]) if "DESCRICAO" in df.columns else pd.Series([], dtype=object)
+        tokens = textos.str.split().explode()
+        tokens = tokens[tokens.notna() & (tokens != "")]
+        pares = pd.DataFrame({"TOKEN": tokens.to_numpy(dtype=object), "LINHA": tokens.index.to_numpy()})
+        pares = pares.drop_duplicates()
+
+        self.vocabulario, ids = np.unique(pares["TOKEN"].to_numpy(dtype=object), return_inverse=True)
+        ordem = np.argsort(ids, kind="stable")
+        self.linhas = pares["LINHA"].to_numpy()[ordem].astype(np.int32)
+        self.inicio = np.searchsorted(ids[ordem], np.arange(len(self.vocabulario) + 1))
+
+        trigramas = {}
+        self.qtd_trigramas = np.zeros(len(self.vocabulario), dtype=np.int32)
+        for i, token in enumerate(self.vocabulario.tolist()):
+            tris = _trigramas(token)
+            self.qtd_trigramas[i] = len(tris)
+            for tri in tris:
+                trigramas.setdefault(tri, []).append(i)
+        self.trigramas = {tri: np.array(ids_, dtype=np.int32) for tri, ids_ in trigramas.items()}
+
+    def _termos(self, token):
+        """Ids do vocabulário que casam com ``token`` e o peso de cada um."""
+        inicio = int(np.searchsorted(self.vocabulario, token, side="left"))
+        fim = int(np.searchsorted(self.vocabulario, token + "\U0010ffff", side="left"))
+        if fim > inicio:
+            ids = np.arange(inicio, fim)
+            pesos = np.where(self.vocabulario[ids] == token, self.PESO_EXATO, self.PESO_PREFIXO)
+            return ids, pesos
+
+        tris_token = _trigramas(token)
+        tris = [self.trigramas[t] for t in tris_token if t in self.trigramas]
+        if not tris:
+            return np.array([], dtype=int), np.array([])
+        comuns = np.bincount(np.concatenate(tris), minlength=len(self.vocabulario))
+        candidatos = np.flatnonzero(comuns)
+        # Similaridade de Jaccard entre os conjuntos de trigramas
+        similaridade = comuns[candidatos] / (
+            len(tris_token) + self.qtd_trigramas[candidatos] - comuns[candidatos])
+        bons = similaridade >= self.SIMILARIDADE_MINIMA
+        melhores = np.argsort(-similaridade[bons], kind="stable")[:5]
+        return candidatos[bons][melhores], similaridade[bons][melhores] * self.PESO_APROXIMADO
+
+    def buscar(self, consulta, limite=50, faixa=None):
+        """Retorna ``(posicoes, pontuacoes)`` das linhas mais relevantes.
+
+        Linhas que casam com mais termos da consulta vêm primeiro; entre
+        elas, vale a soma dos pesos (exato > prefixo > aproximado). ``faixa``
+        restringe o resultado a um intervalo ``(inicio, fim)`` de linhas.
+        """
+        termos = normalizar_texto(pd.Series([consulta])).iloc[0].split()
+        por_termo = []
+        for token in dict.fromkeys(termos):
+            ids, pesos = self._termos(token)
+            if not len(ids):
+                continue
+            tamanhos = self.inicio[ids + 1] - self.inicio[ids]
+            linhas = np.concatenate([self.linhas[self.inicio[i]:self.inicio[i + 1]] for i in ids])
+            por_termo.append(
+                pd.DataFrame({"LINHA": linhas, "PESO": np.repeat(pesos, tamanhos)})
+                .groupby("LINHA")["PESO"].max()
+            )
+        if not por_termo:
+            return np.array([], dtype=int), np.array([])
+
+        todos = pd.concat(por_termo)
+        if faixa is not None:
+            todos = todos[(todos.index >= faixa[0]) & (todos.index < faixa[1])]
+        placar = todos.groupby(level=0).agg(["count", "sum"])
+        placar = placar.sort_values(["count", "sum"], ascending=False, kind="stable").head(limite)
+        return placar.index.to_numpy(), placar["sum"].to_numpy()
+
+
+@st.cache_resource(show_spinner="Indexando descrições...")
+@cronometrado("catalogo.indice_texto")
+def carregar_indice_texto():
+    return IndiceTexto(_catalogo_compartilhado())
+
+
+@cronometrado("catalogo.buscar_por_descricao")
+def buscar_por_descricao(df, consulta, limite=50, fornecedor=None):
+    """Linhas do catálogo ``df`` mais parecidas com ``consulta``, com a coluna SCORE."""
+    faixa = carregar_indice_catalogo().faixas.get(fornecedor, (0, 0)) if fornecedor else None
+    posicoes, pontuacoes = carregar_indice_texto().buscar(consulta, limite, faixa)
+    resultado = df.iloc[posicoes].reset_index(drop=True)
+    resultado["SCORE"] = pontuacoes.round(2)
+    return resultado
@@ -0,0 +1,203 @@
+import json
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from catalogo import codigo_completo, limpar_prefixo, normalizar_chaves
+from metricas import METRICAS, cronometrado
+
+# Incrementar quando mudar o esquema gravado por montar_banco
+VERSAO_BANCO = 1
+LINHAS_POR_INSERCAO = 50_000
+# Abaixo do limite de parâmetros por comando das versões antigas do SQLite (999)
+MAX_PARAMETROS = 900
+# Índices criados quando todas as colunas existem no catálogo. Os dois
+# primeiros atendem aos filtros por FORNECEDOR (coluna inicial) e às
+# buscas de código dentro do fornecedor; os outros, às buscas gerais.
+INDICES = {
+    "produtos_fornecedor_cb": ("FORNECEDOR", "CODIGO BARRA"),
+    "produtos_fornecedor_codigo": ("FORNECEDOR", "CODIGO"),
+    "produtos_cb": ("CODIGO BARRA",),
+    "produtos_codigo": ("CODIGO",),
+}
+
+
+def _q(coluna):
+    return '"' + coluna.replace('"', '""') + '"'
+
+
+def _assinatura(snapshot):
+    info = os.stat(snapshot)
+    return {"versao": VERSAO_BANCO, "snapshot": str(snapshot), "tamanho": info.st_size, "mtime_ns": info.st_mtime_ns}
+
+
+def _assinatura_gravada(arquivo):
+    if not arquivo.exists():
+        return None
+    try:
+        con = sqlite3.connect(f"{arquivo.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return json.loads(con.execute("SELECT valor FROM meta WHERE chave = 'assinatura'").fetchone()[0])
+        finally:
+            con.close()
+    except (sqlite3.Error, TypeError, ValueError):
+        return None
+
+
+@cronometrado("catalogo.montar_sqlite")
+def montar_banco(snapshot, arquivo):
+    """Copia o snapshot Arrow para uma tabela SQLite ``produtos`` com índices.
+
+    ``LINHA`` é a posição da linha no snapshot (ordenado por FORNECEDOR),
+    para que, em códigos repetidos, valha a primeira linha, como no índice
+    em memória. O banco é gravado num arquivo temporário e trocado de uma
+    vez, então outros processos nunca veem um banco pela metade.
+    """
+    tabela = feather.read_table(snapshot, memory_map=True)
+    colunas = tabela.column_names
+    temporario = arquivo.with_name(f"{arquivo.name}.{os.getpid()}.tmp")
+    temporario.unlink(missing_ok=True)
+    con = sqlite3.connect(temporario)
+    try:
+        con.execute("PRAGMA journal_mode=OFF")
+        con.execute("PRAGMA synchronous=OFF")
+        con.execute(f"CREATE TABLE produtos (LINHA INTEGER PRIMARY KEY, {', '.join(_q(c) + ' TEXT' for c in colunas)})")
+        insercao = f"INSERT INTO produtos VALUES (?, {', '.join('?' * len(colunas))})"
+        inicio = 0
+        for lote in tabela.to_batches(max_chunksize=LINHAS_POR_INSERCAO):
+            valores = [lote.column(i).to_pylist() for i in range(lote.num_columns)]
+            con.executemany(insercao, zip(range(inicio, inicio + lote.num_rows), *valores))
+            inicio += lote.num_rows
+        for nome, cols in INDICES.items():
+            if all(c in colunas for c in cols):
+                con.execute(f"CREATE INDEX {nome} ON produtos ({', '.join(map(_q, cols))})")
+        con.execute("CREATE TABLE meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        con.execute("INSERT INTO meta VALUES ('assinatura', ?)", (json.dumps(_assinatura(snapshot)),))
+        con.commit()
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+    os.replace(temporario, arquivo)
+    METRICAS.contar("catalogo.linhas_sqlite", inicio)
+
+
+class CatalogoSQLite:
+    """Consultas das telas num banco SQLite indexado, montado a partir do snapshot.
+
+    Mesma interface de ``catalogo.CatalogoMemoria``. Cada consulta lê só as
+    linhas pedidas, pelos índices de ``INDICES``; o processo não guarda o
+    catálogo em memória, só a lista de fornecedores. O banco é remontado
+    quando o snapshot muda. As conexões (somente leitura) ficam num pool e
+    podem ser usadas pelas tarefas em segundo plano.
+    """
+
+    def __init__(self, snapshot, arquivo=None):
+        self.arquivo = arquivo or snapshot.with_suffix(".sqlite3")
+        if _assinatura_gravada(self.arquivo) != _assinatura(snapshot):
+            montar_banco(snapshot, self.arquivo)
+        self._livres = queue.SimpleQueue()
+        self.colunas = [c for _, c, *_ in self._consultar("PRAGMA table_info(produtos)") if c != "LINHA"]
+        self.fornecedores = [f for (f,) in self._consultar(
+            "SELECT DISTINCT FORNECEDOR FROM produtos ORDER BY FORNECEDOR")] if "FORNECEDOR" in self.colunas else []
+
+    @contextmanager
+    def _conexao(self):
+        try:
+            con = self._livres.get_nowait()
+        except queue.Empty:
+            con = sqlite3.connect(f"{self.arquivo.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+            # Páginas lidas via mmap ficam no cache do sistema, compartilhadas entre processos
+            con.execute("PRAGMA mmap_size=268435456")
+        try:
+            yield con
+        finally:
+            self._livres.put(con)
+
+    def _consultar(self, sql, params=()):
+        with self._conexao() as con:
+            return con.execute(sql, params).fetchall()
+
+    def _filtro_fornecedor(self, fornecedor):
+        if fornecedor is None:
+            return "", []
+        return " AND FORNECEDOR = ?", [fornecedor]
+
+    @cronometrado("catalogo.produto")
+    def produto(self, codigo, coluna, fornecedor=None):
+        """Linha do catálogo (``pd.Series``) para o código, ou None."""
+        chave = normalizar_chaves([codigo], coluna).iat[0]
+        if not chave or coluna not in self.colunas:
+            return None
+        filtro, params = self._filtro_fornecedor(fornecedor)
+        with self._conexao() as con:
+            cursor = con.execute(
+                f"SELECT * FROM produtos WHERE {_q(coluna)} = ?{filtro} ORDER BY LINHA LIMIT 1", [chave, *params])
+            linha = cursor.fetchone()
+            nomes = [d[0] for d in cursor.description]
+        if linha is None:
+            return None
+        return pd.Series(dict(zip(nomes[1:], linha[1:])), name=linha[0], dtype=object)
+
+    @cronometrado("catalogo.produtos")
+    def produtos(self, codigos, coluna, fornecedor=None, colunas=None):
+        """Consulta vários códigos de uma vez; mesmo retorno de ``CatalogoMemoria.produtos``."""
+        chaves = normalizar_chaves(pd.Series(codigos, dtype=object), coluna).to_numpy(dtype=object)
+        colunas = list(colunas) if colunas is not None else self.colunas
+        presentes = [c for c in colunas if c in self.colunas]
+        achados = {}
+        if coluna in self.colunas:
+            distintas = [c for c in dict.fromkeys(chaves.tolist()) if c]
+            filtro, params = self._filtro_fornecedor(fornecedor)
+            # Nas colunas soltas ao lado de MIN(LINHA), o SQLite devolve os valores dessa linha
+            campos = ", ".join([_q(coluna), "MIN(LINHA)", *map(_q, presentes)])
+            for i in range(0, len(distintas), MAX_PARAMETROS):
+                parte = distintas[i:i + MAX_PARAMETROS]
+                for chave, _, *valores in self._consultar(
+                        f"SELECT {campos} FROM produtos WHERE {_q(coluna)} IN ({', '.join('?' * len(parte))})"
+                        f"{filtro} GROUP BY {_q(coluna)}", [*parte, *params]):
+                    achados[chave] = valores
+        mascara = np.array([c in achados for c in chaves], dtype=bool)
+        linhas = pd.DataFrame([achados[c] for c in chaves[mascara]], columns=presentes, dtype=object)
+        return mascara, linhas.reindex(columns=colunas, fill_value="")
+
+    @cronometrado("catalogo.sugestoes")
+    def sugestoes(self, fornecedor, coluna, prefixo, limite=20):
+        """Até ``limite`` códigos distintos do fornecedor que começam com ``prefixo``.
+
+        Um código de barras digitado por inteiro também acha a sua chave
+        (``catalogo.codigo_completo``), que vem primeiro.
+        """
+        if coluna not in self.colunas or "FORNECEDOR" not in self.colunas:
+            return [], 0
+        exato = codigo_completo(prefixo, coluna)
+        prefixo = limpar_prefixo(prefixo, coluna)
+        c = _q(coluna)
+        descricao = _q("DESCRICAO") if "DESCRICAO" in self.colunas else "''"
+        consulta = f"SELECT {c}, {descricao}, MIN(LINHA) FROM produtos WHERE FORNECEDOR = ? AND {c} <> ''"
+        exatos = self._consultar(f"{consulta} AND {c} = ? GROUP BY {c}", [fornecedor, exato]) if exato else []
+        filtro, params = "", [fornecedor]
+        if prefixo:
+            filtro, params = f" AND {c} >= ? AND {c} < ?", [fornecedor, prefixo, prefixo + "\U0010ffff"]
+        achados = exatos + self._consultar(f"{consulta}{filtro} GROUP BY {c} ORDER BY {c} LIMIT ?",
+                                           [*params, limite - len(exatos)])
+        total = len(exatos) + self._consultar(
+            f"SELECT COUNT(DISTINCT {c}) FROM produtos WHERE FORNECEDOR = ? AND {c} <> ''{filtro}", params)[0][0]
+        return [(cod, desc) for cod, desc, _ in achados], total
+
+    @cronometrado("catalogo.origens")
+    def origens(self, fornecedores):
+        """Pares distintos FORNECEDOR / __ORIGEM_PLANILHA__ dos fornecedores dados."""
+        colunas = ["FORNECEDOR", "__ORIGEM_PLANILHA__"]
+        linhas = []
+        fornecedores = list(fornecedores)
+        for i in range(0, len(fornecedores), MAX_PARAMETROS):
+            parte = fornecedores[i:i + MAX_PARAMETROS]
+            linhas += self._consultar(
+                f"SELECT FORNECEDOR, {_q(colunas[1])} FROM produtos WHERE FORNECEDOR IN ({', '.join('?' * len(parte))})"
+                f" GROUP BY FORNECEDOR, {_q(colunas[1])} ORDER BY FORNECEDOR, MIN(LINHA)", parte)
+        return pd.DataFrame(linhas, columns=colunas)
@@ -0,0 +1,101 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+
+# Pesos do dígito verificador GTIN para os 13 primeiros dígitos do GTIN-14
+PESOS_GTIN = np.array([3, 1] * 6 + [3])
+# Menos dígitos significativos que isso não é GTIN (código interno, PLU de balança)
+MIN_DIGITOS_GTIN = 7
+VAZIOS = ("", "nan", "none", "<na>", "nat")
+_CIENTIFICO = re.compile(r"\d+(\.\d+)?[eE]\+?\d+")
+
+
+def _decimal_para_inteiro(valor):
+    try:
+        return format(Decimal(valor), "f")
+    except InvalidOperation:
+        return valor
+
+
+def _digitos(s):
+    return s.isascii() and s.isdigit()
+
+
+def limpar_texto(serie):
+    """Só remove espaços e vazios (``nan``, ``None``); usado nos códigos de referência (REF)."""
+    s = pd.Series(serie, dtype=object).fillna("").astype(str).str.strip()
+    return s.mask(s.str.lower().isin(VAZIOS), "")
+
+
+def limpar_codigos(serie):
+    """Remove espaços e artefatos do Excel: ``7891234567890.0``, ``7.89123456789E+12``, ``nan``.
+
+    Só para códigos de barras: numa REF, ``12E4`` ou ``10.00`` são o próprio código.
+    """
+    s = limpar_texto(serie)
+    cientifico = s.str.fullmatch(_CIENTIFICO.pattern)
+    if cientifico.any():
+        s = s.mask(cientifico, s[cientifico].map(_decimal_para_inteiro))
+    return s.str.replace(r"^(\d+)\.0*$", r"\1", regex=True)
+
+
+def normalizar_cb(serie):
+    """Forma canônica dos códigos de barras: EAN-8/12/13 e GTIN-14 com zeros
+    à esquerda viram 13 dígitos; GTIN-14 de verdade mantém os 14.
+
+    Valores não numéricos só passam por ``limpar_codigos``.
+    """
+    s = limpar_codigos(serie)
+    numerico = s.str.fullmatch(r"\d{1,14}")
+    sem_zeros = s.str.lstrip("0")
+    canonico = sem_zeros.str.zfill(13).where(sem_zeros != "", "")
+    return canonico.where(numerico, s)
+
+
+def cb_valido(serie):
+    """Máscara booleana: o código é um GTIN com dígito verificador correto."""
+    s = normalizar_cb(serie)
+    valido = s.str.fullmatch(r"\d{13,14}") & (s.str.lstrip("0").str.len() >= MIN_DIGITOS_GTIN)
+    if valido.any():
+        gtin = s[valido].str.zfill(14)
+        digitos = np.frombuffer("".join(gtin).encode("ascii"), dtype=np.uint8).reshape(-1, 14) - ord("0")
+        soma = digitos[:, :13].astype(np.int64) @ PESOS_GTIN
+        valido.loc[valido] = (10 - soma % 10) % 10 == digitos[:, 13]
+    return valido.to_numpy(dtype=bool)
+
+
+def normalizar_codigo(valor):
+    """``normalizar_cb`` para um único valor, só com operações de ``str``.
+
+    Chamada a cada consulta à API; montar uma Series aqui custaria
+    milissegundos por código.
+    """
+    s = "" if valor is None else str(valor).strip()
+    if s.lower() in VAZIOS:
+        return ""
+    if _CIENTIFICO.fullmatch(s):
+        s = _decimal_para_inteiro(s)
+    inteiro, ponto, decimais = s.partition(".")
+    if ponto and _digitos(inteiro) and not decimais.strip("0"):
+        s = inteiro
+    if _digitos(s) and len(s) <= 14:
+        sem_zeros = s.lstrip("0")
+        return sem_zeros.zfill(13) if sem_zeros else ""
+    return s
+
+
+def codigo_valido(valor):
+    """``cb_valido`` para um único valor."""
+    s = normalizar_codigo(valor)
+    if not (_digitos(s) and len(s) in (13, 14) and len(s.lstrip("0")) >= MIN_DIGITOS_GTIN):
+        return False
+    s = s.zfill(14)
+    soma = sum(int(d) * p for d, p in zip(s[:13], PESOS_GTIN.tolist()))
+    return (10 - soma % 10) % 10 == int(s[13])
+
+
+def gtin14(cb):
+    """Código canônico no formato de 14 dígitos usado pela API do Varejo Fácil."""
+    return normalizar_codigo(cb).zfill(14)
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from codigo_barras import normalizar_cb
+from metricas import cronometrado
+
+COLUNAS_PRODUTO = ["CODIGO", "FORNECEDOR", "DESCRICAO"]
+COLUNAS_CONFERENCIA = ["CODIGO BARRA", *COLUNAS_PRODUTO, "ENVIADO", "RECEBIDO", "DIVERGENCIA", "SITUACAO"]
+# Ordem do relatório: primeiro o que precisa de atenção
+SITUACOES = ["FALTANDO", "SOBRANDO", "A MENOS", "A MAIS", "OK"]
+
+
+def quantidades(serie):
+    """Quantidades numéricas (aceita vírgula decimal); vazio ou inválido vira 0."""
+    texto = serie.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(texto, errors="coerce").fillna(0)
+
+
+def contar_leituras(codigos):
+    """Contagem recebida a partir de uma lista de leituras do leitor de código de barras."""
+    serie = normalizar_cb(codigos)
+    contagem = serie[serie != ""].value_counts(sort=False)
+    return pd.DataFrame({"CODIGO BARRA": contagem.index, "RECEBIDO": contagem.to_numpy()})
+
+
+def _somar_por_codigo(df, coluna_qtd):
+    df = df.assign(**{"CODIGO BARRA": normalizar_cb(df["CODIGO BARRA"]).to_numpy(),
+                      coluna_qtd: quantidades(df[coluna_qtd]).to_numpy()})
+    df = df[df["CODIGO BARRA"] != ""]
+    agregacao = {c: "first" for c in COLUNAS_PRODUTO if c in df.columns}
+    agregacao[coluna_qtd] = "sum"
+    return df.groupby("CODIGO BARRA", sort=False, as_index=False).agg(agregacao)
+
+
+@cronometrado("conferencia.conciliar")
+def conciliar(enviado, recebido, catalogo=None):
+    """Cruza o que foi enviado com o que foi recebido, pelo código de barras.
+
+    ``enviado`` tem CODIGO BARRA e ENVIADO (e opcionalmente as colunas de
+    produto); ``recebido`` tem CODIGO BARRA e RECEBIDO. Códigos repetidos
+    são somados e normalizados antes do cruzamento. Com ``catalogo`` (de
+    ``catalogo.obter_catalogo``), as colunas de produto vazias, como as dos
+    itens que sobraram, são completadas pelo catálogo. Cada linha recebe uma SITUACAO: FALTANDO
+    (enviado e não recebido), SOBRANDO (recebido sem ter sido enviado),
+    A MENOS, A MAIS ou OK.
+    """
+    env = _somar_por_codigo(enviado, "ENVIADO")
+    rec = _somar_por_codigo(recebido[["CODIGO BARRA", "RECEBIDO"]], "RECEBIDO")
+    res = env.merge(rec, on="CODIGO BARRA", how="outer", indicator=True)
+    res[["ENVIADO", "RECEBIDO"]] = res[["ENVIADO", "RECEBIDO"]].fillna(0)
+    res["DIVERGENCIA"] = res["RECEBIDO"] - res["ENVIADO"]
+    res["SITUACAO"] = np.select(
+        [res["_merge"] == "left_only", res["_merge"] == "right_only",
+         res["DIVERGENCIA"] < 0, res["DIVERGENCIA"] > 0],
+        SITUACOES[:4], "OK")
+
+    res = res.reindex(columns=COLUNAS_CONFERENCIA)
+    res[COLUNAS_PRODUTO] = res[COLUNAS_PRODUTO].fillna("").astype(str)
+    if catalogo is not None:
+        achados, linhas = catalogo.produtos(res["CODIGO BARRA"], "CODIGO BARRA", colunas=COLUNAS_PRODUTO)
+        for coluna in COLUNAS_PRODUTO:
+            vazio = (res[coluna] == "").to_numpy() & achados
+            do_catalogo = linhas[coluna].astype(str).to_numpy(dtype=object)
+            res.loc[vazio, coluna] = do_catalogo[vazio[achados]]
+
+    ordem = pd.Categorical(res["SITUACAO"], categories=SITUACOES, ordered=True)
+    return res.iloc[np.argsort(ordem.codes, kind="stable")].reset_index(drop=True)
@@ -0,0 +1,163 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime as dt
+from functools import lru_cache
+from pathlib import Path
+
+ARQUIVO_DIARIO = Path(os.environ.get("MIMI_CACHE_DIR", ".cache_mimi")) / "diario.sqlite3"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    usuario TEXT,
+    descricao TEXT,
+    criado_em TEXT,
+    total INTEGER
+);
+CREATE TABLE IF NOT EXISTS itens (
+    job_id TEXT,
+    linha INTEGER,
+    dados TEXT,
+    status TEXT,
+    resultado TEXT,
+    atualizado_em TEXT,
+    PRIMARY KEY (job_id, linha)
+);
+CREATE TABLE IF NOT EXISTS escritas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT,
+    linha INTEGER,
+    produto_id INTEGER,
+    loja_id INTEGER,
+    tipo TEXT,
+    valor REAL,
+    status TEXT,
+    status_http INTEGER,
+    erro TEXT,
+    enviado_em TEXT,
+    respondido_em TEXT
+);
+CREATE INDEX IF NOT EXISTS escritas_item ON escritas (job_id, linha, loja_id, status);
+"""
+
+
+def _agora():
+    return dt.now().astimezone().isoformat()
+
+
+class Diario:
+    """Diário (write-ahead) em SQLite das atualizações enviadas ao Varejo Fácil.
+
+    Cada job guarda seus itens; cada PUT de loja é gravado como ENVIADO
+    antes de sair e depois marcado OK/ERRO com o status HTTP. Ao retomar
+    um job, itens já OK são pulados e, nos demais, só as lojas sem
+    escrita OK são reenviadas.
+    """
+
+    def __init__(self, caminho=ARQUIVO_DIARIO):
+        Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(caminho, check_same_thread=False, isolation_level=None)
+        self._trava = threading.Lock()
+        with self._trava:
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.executescript(ESQUEMA)
+
+    def _executar(self, sql, params=()):
+        with self._trava:
+            return self._con.execute(sql, params).fetchall()
+
+    # --- jobs e itens ---
+    def criar_job(self, itens, usuario="", descricao=""):
+        job_id = uuid.uuid4().hex[:12]
+        agora = _agora()
+        with self._trava:
+            self._con.execute("BEGIN")
+            self._con.execute("INSERT INTO jobs VALUES (?, ?, ?, ?, ?)",
+                              (job_id, usuario, descricao, agora, len(itens)))
+            self._con.executemany(
+                "INSERT INTO itens VALUES (?, ?, ?, 'PENDENTE', NULL, ?)",
+                [(job_id, item["LINHA"], json.dumps(item), agora) for item in itens],
+            )
+            self._con.execute("COMMIT")
+        return job_id
+
+    def itens_pendentes(self, job_id):
+        """Itens que ainda não terminaram OK (pendentes, parciais ou com erro)."""
+        linhas = self._executar(
+            "SELECT dados FROM itens WHERE job_id = ? AND status != 'OK' ORDER BY linha", (job_id,))
+        return [json.loads(d) for (d,) in linhas]
+
+    def registrar_item(self, job_id, resultado):
+        self._executar(
+            "UPDATE itens SET status = ?, resultado = ?, atualizado_em = ? WHERE job_id = ? AND linha = ?",
+            (resultado["STATUS"], json.dumps(resultado, default=str), _agora(), job_id, resultado["LINHA"]),
+        )
+
+    def resultados(self, job_id):
+        linhas = self._executar(
+            "SELECT resultado FROM itens WHERE job_id = ? AND resultado IS NOT NULL ORDER BY linha", (job_id,))
+        return [json.loads(r) for (r,) in linhas]
+
+    def jobs(self, usuario=None, limite=20):
+        """Resumo dos jobs mais recentes, com a contagem de itens por status."""
+        filtro, params = ("WHERE j.usuario = ?", (usuario,)) if usuario else ("", ())
+        linhas = self._executar(f"""
+            SELECT j.id, j.descricao, j.criado_em, j.total,
+                   SUM(i.status = 'OK'), SUM(i.status = 'PARCIAL'),
+                   SUM(i.status = 'ERRO'), SUM(i.status = 'PENDENTE')
+            FROM jobs j JOIN itens i ON i.job_id = j.id
+            {filtro}
+            GROUP BY j.id ORDER BY j.criado_em DESC LIMIT ?
+        """, params + (limite,))
+        campos = ["id", "descricao", "criado_em", "total", "ok", "parcial", "erro", "pendente"]
+        return [dict(zip(campos, l)) for l in linhas]
+
+    def registro(self, job_id, linha):
+        return RegistroItem(self, job_id, linha)
+
+    # --- escritas por loja ---
+    def escrita_aplicada(self, job_id, linha, loja_id):
+        """Status HTTP da escrita OK já registrada para a loja, ou None."""
+        linhas = self._executar(
+            "SELECT status_http FROM escritas WHERE job_id = ? AND linha = ? AND loja_id = ? AND status = 'OK' LIMIT 1",
+            (job_id, linha, loja_id))
+        return linhas[0][0] if linhas else None
+
+    def registrar_envio(self, job_id, linha, produto_id, loja_id, tipo, valor):
+        with self._trava:
+            cur = self._con.execute(
+                "INSERT INTO escritas (job_id, linha, produto_id, loja_id, tipo, valor, status, enviado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'ENVIADO', ?)",
+                (job_id, linha, produto_id, loja_id, tipo, valor, _agora()))
+            return cur.lastrowid
+
+    def registrar_resposta(self, id_escrita, ok, status_http, erro=""):
+        self._executar(
+            "UPDATE escritas SET status = ?, status_http = ?, erro = ?, respondido_em = ? WHERE id = ?",
+            ("OK" if ok else "ERRO", status_http, erro, _agora(), id_escrita))
+
+
+class RegistroItem:
+    """Visão do diário restrita a um item de um job, usada por ``atualiza``."""
+
+    def __init__(self, diario, job_id, linha):
+        self.diario = diario
+        self.job_id = job_id
+        self.linha = linha
+
+    def aplicada(self, loja_id):
+        return self.diario.escrita_aplicada(self.job_id, self.linha, loja_id)
+
+    def enviando(self, produto_id, loja_id, tipo, valor):
+        return self.diario.registrar_envio(self.job_id, self.linha, produto_id, loja_id, tipo, valor)
+
+    def resposta(self, id_escrita, ok, status_http, erro=""):
+        self.diario.registrar_resposta(id_escrita, ok, status_http, erro)
+
+
+@lru_cache(maxsize=None)
+def obter_diario():
+    return Diario()
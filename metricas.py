@@ -0,0 +1,130 @@
+import csv
+import io
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime as dt
+from functools import wraps
+
+# Limites superiores (ms) das faixas do histograma de latência; a última é aberta
+FAIXAS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class Histograma:
+    def __init__(self):
+        self.contagens = [0] * (len(FAIXAS_MS) + 1)
+        self.n = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def registrar(self, ms):
+        self.contagens[bisect_left(FAIXAS_MS, ms)] += 1
+        self.n += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentil(self, q):
+        """Limite superior da faixa que contém o percentil ``q`` (0–1)."""
+        alvo = q * self.n
+        acumulado = 0
+        for i, c in enumerate(self.contagens):
+            acumulado += c
+            if acumulado >= alvo:
+                return FAIXAS_MS[i] if i < len(FAIXAS_MS) else self.max_ms
+        return self.max_ms
+
+
+class Metricas:
+    """Latências por operação e contadores, em memória e por processo.
+
+    Barato o bastante para ficar ligado sempre: cada registro é uma busca
+    binária numa tupla e alguns incrementos sob uma trava.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self._trava:
+            self.inicio = dt.now().astimezone()
+            self._latencias = {}
+            self._contadores = {}
+
+    def registrar(self, operacao, segundos):
+        with self._trava:
+            self._latencias.setdefault(operacao, Histograma()).registrar(segundos * 1000)
+
+    def contar(self, nome, n=1):
+        with self._trava:
+            self._contadores[nome] = self._contadores.get(nome, 0) + n
+
+    @contextmanager
+    def medir(self, operacao):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(operacao, time.perf_counter() - inicio)
+
+    def latencias(self):
+        with self._trava:
+            return [
+                {"operacao": op, "chamadas": h.n, "media_ms": round(h.total_ms / h.n, 2),
+                 "p50_ms": h.percentil(0.5), "p95_ms": h.percentil(0.95), "p99_ms": h.percentil(0.99),
+                 "max_ms": round(h.max_ms, 2), "total_s": round(h.total_ms / 1000, 3)}
+                for op, h in sorted(self._latencias.items())
+            ]
+
+    def histograma(self, operacao):
+        """Contagem por faixa (rótulo → chamadas) de uma operação."""
+        with self._trava:
+            h = self._latencias.get(operacao)
+            contagens = list(h.contagens) if h else []
+        rotulos = [f"≤{f} ms" for f in FAIXAS_MS] + [f">{FAIXAS_MS[-1]} ms"]
+        return dict(zip(rotulos, contagens))
+
+    def contadores(self):
+        with self._trava:
+            return dict(sorted(self._contadores.items()))
+
+    def resumo(self):
+        return {
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "gerado_em": dt.now().astimezone().isoformat(timespec="seconds"),
+            "latencias": self.latencias(),
+            "contadores": self.contadores(),
+        }
+
+
+METRICAS = Metricas()
+
+
+def cronometrado(operacao):
+    """Decorador: registra a duração de cada chamada em ``METRICAS``."""
+    def decorador(func):
+        @wraps(func)
+        def envolvida(*args, **kwargs):
+            with METRICAS.medir(operacao):
+                return func(*args, **kwargs)
+        return envolvida
+    return decorador
+
+
+def exportar_json(resumo):
+    return json.dumps(resumo, indent=2, ensure_ascii=False, default=str)
+
+
+def exportar_csv(resumo):
+    """Uma linha por operação (latências) e uma por contador, no mesmo CSV."""
+    campos = ["tipo", "nome", "chamadas", "media_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "total_s", "valor"]
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=campos, extrasaction="ignore")
+    w.writeheader()
+    for linha in resumo["latencias"]:
+        w.writerow({"tipo": "latencia", "nome": linha["operacao"], **linha})
+    for nome, valor in resumo["contadores"].items():
+        w.writerow({"tipo": "contador", "nome": nome, "valor": valor})
+    return buf.getvalue()
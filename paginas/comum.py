@@ -0,0 +1,109 @@
+import pandas as pd
+import streamlit as st
+
+from planilhas import UploadInvalido, ler_upload
+from tarefas import CANCELADA, ERRO, obter_executor
+
+
+# ========================= FUNÇÕES COMUNS =========================
+def erro_api(e):
+    st.error(f"❌ Falha de comunicação com o Varejo Fácil: {e}")
+
+def mostrar_rejeitados(desconhecidos, qtd_invalidas):
+    if not qtd_invalidas.empty:
+        st.warning(f"⚠️ {len(qtd_invalidas)} linha(s) com a QTD vazia, fracionária ou grande demais foram ignoradas.")
+        with st.expander("Ver linhas com QTD inválida"):
+            st.dataframe(qtd_invalidas, use_container_width=True)
+    if not desconhecidos.empty:
+        st.warning(f"⚠️ {len(desconhecidos)} código(s) não encontrados para o fornecedor selecionado.")
+        with st.expander("Ver códigos não encontrados"):
+            st.dataframe(desconhecidos, use_container_width=True)
+
+def resolver_upload(tarefa, arquivo, coluna, catalogo, fornecedor):
+    """Tarefa: lê o upload em lotes (``ler_upload``) e resolve cada lote contra o catálogo."""
+    # Importado aqui para o Atualizador de Preços, que usa este módulo, não carregar o catálogo
+    from catalogo import resolver_lote
+
+    partes = []
+    for lote in ler_upload(arquivo, [coluna, "QTD"], ["CODIGO BARRA", "CODIGO"]):
+        tarefa.verificar_cancelamento()
+        partes.append(resolver_lote(lote, coluna, catalogo, fornecedor=fornecedor))
+        tarefa.progresso(tarefa.feito + len(lote), mensagem="Linhas lidas:")
+    if not partes:
+        raise UploadInvalido("A planilha não tem nenhuma linha de dados.")
+    return tuple(pd.concat(p, ignore_index=True) for p in zip(*partes))
+
+def iniciar_tarefa(chave_estado, descricao, func, *args, **kwargs):
+    """Submete ``func`` ao executor de tarefas e guarda o id na sessão, em ``chave_estado``."""
+    tarefa = obter_executor().submeter(descricao, func, *args, **kwargs)
+    st.session_state[chave_estado] = tarefa.id
+    return tarefa
+
+def acompanhar_tarefa(chave_estado, mostrar_parciais=None, intervalo=1.0):
+    """Andamento da tarefa guardada em ``chave_estado``.
+
+    Enquanto ela roda, só este trecho é redesenhado a cada ``intervalo``
+    segundos (``st.fragment``) e o resto da página continua utilizável.
+    Devolve a tarefa uma única vez, no primeiro rerun depois que ela
+    termina (e a tira da sessão), para a página tratar o resultado.
+    """
+    tarefa = obter_executor().obter(st.session_state.get(chave_estado))
+    if tarefa is None:
+        st.session_state.pop(chave_estado, None)
+        return None
+    if tarefa.terminada:
+        del st.session_state[chave_estado]
+        if tarefa.status == ERRO:
+            st.error(f"❌ {tarefa.descricao}: {tarefa.erro}")
+        elif tarefa.status == CANCELADA:
+            st.warning(f"⏹️ {tarefa.descricao}: cancelada.")
+        return tarefa
+
+    @st.fragment(run_every=intervalo)
+    def painel():
+        if tarefa.terminada:
+            st.rerun()  # redesenha a página inteira para ela tratar o resultado
+        st.progress(tarefa.fracao, text=f"⏳ {tarefa.descricao} — {tarefa.texto_progresso()}")
+        if mostrar_parciais:
+            mostrar_parciais(tarefa.parciais())
+        if st.button("⏹️ Cancelar", key=f"{chave_estado}_cancelar"):
+            tarefa.cancelar()
+
+    painel()
+    return None
+
+def upload_novo(arquivo, *contexto):
+    """True só na primeira vez que o arquivo (com o mesmo contexto) aparece na sessão."""
+    assinatura = (arquivo.file_id, *contexto)
+    vistos = st.session_state.setdefault("uploads_processados", set())
+    if assinatura in vistos:
+        return False
+    vistos.add(assinatura)
+    return True
+
+def editor_carrinho(carrinho, key):
+    """Tabela do carrinho com a quantidade editável; quantidade 0 remove o item."""
+    visao = carrinho.df()
+    editado = st.data_editor(
+        visao, key=f"{key}_{carrinho.versao}", use_container_width=True, hide_index=True,
+        disabled=[c for c in carrinho.colunas if c != carrinho.coluna_qtd],
+        column_config={carrinho.coluna_qtd: st.column_config.NumberColumn(min_value=0, step=1)},
+    )
+    if carrinho.aplicar_edicao(editado):
+        st.rerun()
+    return visao
+
+def seletor_codigo(area, catalogo, fornecedor, coluna, rotulo, key, limite=20):
+    """Caixa de busca por prefixo + lista curta com os códigos encontrados."""
+    prefixo = area.text_input(f"Digite o início do {rotulo}:", key=f"{key}_prefixo")
+    sugestoes, total = catalogo.sugestoes(fornecedor, coluna, prefixo, limite)
+    descricoes = dict(sugestoes)
+    escolhido = area.selectbox(
+        rotulo + ":", [""] + list(descricoes), key=key,
+        format_func=lambda c: f"{c} — {descricoes[c]}" if c else "",
+    )
+    if total > len(sugestoes):
+        area.caption(f"Mostrando {len(sugestoes)} de {total}. Digite mais caracteres para refinar.")
+    elif prefixo and not total:
+        area.caption("Nenhum código encontrado.")
+    return escolhido
@@ -0,0 +1,30 @@
+import streamlit as st
+
+from catalogo import obter_catalogo
+
+
+# ========================= APP 6: PROCURA DE FORNECEDOR =========================
+
+def app_procura_fornecedor():
+    st.header("🔎 Procura de Fornecedor")
+    st.divider()
+    
+    catalogo = obter_catalogo()
+    
+    if "__ORIGEM_PLANILHA__" not in catalogo.colunas:
+        st.error("A coluna '__ORIGEM_PLANILHA__' não foi encontrada no dataset.")
+        return
+
+    selecionados = st.multiselect("Selecione os fornecedores que deseja localizar:", catalogo.fornecedores)
+
+    if selecionados:
+        resultado = (
+            catalogo.origens(selecionados)
+            .sort_values(by="FORNECEDOR", kind="stable")
+            .rename(columns={"__ORIGEM_PLANILHA__": "PLANILHA DE ORIGEM"})
+        )
+
+        st.subheader(f"📍 Origem dos fornecedores selecionados ({len(resultado)})")
+        st.dataframe(resultado, use_container_width=True)
+    else:
+        st.info("Selecione ao menos um fornecedor para visualizar as origens.")
@@ -0,0 +1,48 @@
+import hmac
+
+import pandas as pd
+import streamlit as st
+
+from metricas import METRICAS, exportar_csv, exportar_json
+from varejo_facil import estatisticas_cache
+
+
+# ========================= APP 7: MÉTRICAS =========================
+def app_metricas():
+    st.header("📊 Métricas de Desempenho")
+    st.divider()
+
+    if not st.session_state.get("admin_ok"):
+        senha = st.text_input("🔐 Senha de administrador", type="password")
+        if st.button("Entrar", key="admin_entrar"):
+            if hmac.compare_digest(senha.encode(), str(st.secrets["admin"]["senha"]).encode()):
+                st.session_state.admin_ok = True
+                st.rerun()
+            st.error("Senha incorreta.")
+        return
+
+    resumo = {**METRICAS.resumo(), "cache_api": estatisticas_cache()}
+    st.caption(f"Coletadas neste processo desde {resumo['inicio']}.")
+
+    st.subheader("⏱️ Latência por operação")
+    if resumo["latencias"]:
+        latencias = pd.DataFrame(resumo["latencias"]).sort_values("total_s", ascending=False)
+        st.dataframe(latencias, use_container_width=True, hide_index=True)
+        op = st.selectbox("Histograma da operação:", latencias["operacao"].tolist())
+        hist = pd.Series(METRICAS.histograma(op), name="chamadas")
+        st.bar_chart(hist[hist.cumsum() > 0])
+    else:
+        st.info("Nenhuma operação registrada ainda.")
+
+    c1, c2 = st.columns(2)
+    c1.subheader("🔢 Contadores")
+    c1.dataframe(pd.Series(resumo["contadores"], name="valor", dtype="int64"), use_container_width=True)
+    c2.subheader("🗃️ Cache da API")
+    c2.dataframe(pd.DataFrame(resumo["cache_api"]).T, use_container_width=True)
+
+    c1, c2, c3 = st.columns(3)
+    c1.download_button("⬇️ Exportar JSON", exportar_json(resumo), "metricas.json", mime="application/json")
+    c2.download_button("⬇️ Exportar CSV", exportar_csv(resumo), "metricas.csv", mime="text/csv")
+    if c3.button("🧹 Zerar métricas"):
+        METRICAS.limpar()
+        st.rerun()
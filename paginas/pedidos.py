@@ -0,0 +1,104 @@
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from carrinho import Carrinho
+from catalogo import obter_catalogo
+from paginas.comum import (acompanhar_tarefa, editor_carrinho, iniciar_tarefa, mostrar_rejeitados, resolver_upload,
+                           seletor_codigo, upload_novo)
+from planilhas import exportar_xlsx
+from tarefas import CONCLUIDA
+
+
+def gerar_planilha(tarefa, itens, versao):
+    """Tarefa: exporta ``itens`` (uma cópia do carrinho na ``versao`` dada)."""
+    return versao, exportar_xlsx(itens, "Pedidos")
+
+
+# ========================= APP 2: PEDIDOS =========================
+def app_pedidos():
+    st.header("🛍️ Processo de Pedidos")
+    st.divider()
+    
+    if "produtos_solicitados" not in st.session_state:
+        st.session_state.produtos_solicitados = Carrinho(
+            ["FORNECEDOR", "CODIGO BARRA", "CODIGO", "DESCRICAO", "QTD", "ORIGEM"], "QTD")
+    carrinho = st.session_state.produtos_solicitados
+
+    catalogo = obter_catalogo()
+    aba1, aba2, aba3 = st.tabs(["🧍 Individual", "📂 Lote", "📋 Revisão"])
+
+    # --- Aba 1: Individual ---
+    with aba1:
+        forn = st.selectbox("Fornecedor:", catalogo.fornecedores)
+        tipo = st.selectbox("Buscar por:", ["CÓDIGO DE BARRAS", "REF"])
+        col = "CODIGO BARRA" if tipo == "CÓDIGO DE BARRAS" else "CODIGO"
+        opc = seletor_codigo(st, catalogo, forn, col, tipo, key="pedidos_produto")
+        qtd = st.number_input("Quantidade:", 1, step=1)
+
+        if st.button("➕ Adicionar Pedido"):
+            p = catalogo.produto(opc, col, fornecedor=forn)
+            if p is not None:
+                it = {
+                    "FORNECEDOR": forn,
+                    "CODIGO BARRA": p["CODIGO BARRA"],
+                    "CODIGO": p["CODIGO"],
+                    "DESCRICAO": p["DESCRICAO"],
+                    "QTD": qtd,
+                    "ORIGEM": p.get("__ORIGEM_PLANILHA__", "")
+                }
+                carrinho.adicionar(it)
+                st.toast("✅ Produto adicionado!")
+            else:
+                st.error("Produto não encontrado.")
+
+    # --- Aba 2: Lote ---
+    with aba2:
+        c1, c2 = st.columns(2)
+        if c1.button("📥 Baixar Modelo Excel"):
+            modelo = pd.DataFrame(columns=["CODIGO BARRA", "CODIGO", "QTD"])
+            buf = BytesIO()
+            with pd.ExcelWriter(buf, engine='openpyxl') as w:
+                modelo.to_excel(w, index=False, sheet_name="Modelo")
+            buf.seek(0)
+            st.download_button("⬇️", buf, "modelo_pedido.xlsx")
+
+        fornecedor_lote = c2.selectbox("Fornecedor para Lote:", catalogo.fornecedores)
+        arq = c2.file_uploader("📤 Enviar Excel", type=["xlsx"])
+        tipo_col = st.selectbox("Usar como identificador:", ["CÓDIGO DE BARRAS", "REF"])
+        col_id = "CODIGO BARRA" if tipo_col == "CÓDIGO DE BARRAS" else "CODIGO"
+
+        if arq and upload_novo(arq, col_id, fornecedor_lote):
+            # Busca restrita ao fornecedor selecionado
+            iniciar_tarefa("pedidos_tarefa_upload", f"Leitura de {arq.name}", resolver_upload,
+                           BytesIO(arq.getvalue()), col_id, catalogo, fornecedor_lote)
+
+        tarefa = acompanhar_tarefa("pedidos_tarefa_upload")
+        if tarefa and tarefa.status == CONCLUIDA:
+            encontrados, desconhecidos, qtd_invalidas = tarefa.resultado
+            carrinho.adicionar_df(encontrados.rename(columns={"__ORIGEM_PLANILHA__": "ORIGEM"}))
+
+            mostrar_rejeitados(desconhecidos, qtd_invalidas)
+            if len(encontrados):
+                st.toast(f"✅ {len(encontrados)} produtos adicionados!")
+
+    # --- Aba 3: Revisão ---
+    with aba3:
+        if len(carrinho):
+            df_f = editor_carrinho(carrinho, "pedidos_editor")
+
+            if st.button("📤 Gerar Planilha Final"):
+                iniciar_tarefa("pedidos_tarefa_planilha", "Geração da planilha", gerar_planilha,
+                               df_f.copy(), carrinho.versao)
+
+            tarefa = acompanhar_tarefa("pedidos_tarefa_planilha")
+            if tarefa and tarefa.status == CONCLUIDA:
+                st.session_state.pedidos_planilha = tarefa.resultado
+            # Só oferece a planilha se o carrinho não mudou depois de gerada
+            versao, buf = st.session_state.get("pedidos_planilha", (None, None))
+            if versao == carrinho.versao:
+                st.success("Planilha pronta!")
+                st.download_button("⬇️", buf, "pedidos.xlsx")
+        else:
+            st.info("Nenhum pedido adicionado.")
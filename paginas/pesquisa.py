@@ -0,0 +1,137 @@
+import pandas as pd
+import requests
+import streamlit as st
+
+from catalogo import buscar_por_descricao, carregar_csv_combinado, obter_catalogo
+from codigo_barras import cb_valido, codigo_valido, normalizar_cb
+from paginas.comum import erro_api
+from planilhas import UploadInvalido, exportar_xlsx, ler_upload
+from varejo_facil import ClienteVarejoFacil, consultar_em_lote, obter_custos, obter_id
+
+
+# ========================= APP 4: PESQUISA DE PRODUTOS (API) =========================
+def app_pesquisa():
+    st.header("🔍 Pesquisa de Produtos (API Varejo Fácil)")
+    st.divider()
+    aba1, aba2, aba3 = st.tabs(["📦 Por Código (API)", "📝 Por Descrição (Catálogo)", "📋 Em Lote"])
+
+    # --- Aba 1: consulta na API ---
+    with aba1:
+        pesquisa_por_codigo()
+
+    # --- Aba 2: busca por descrição no catálogo ---
+    with aba2:
+        st.markdown("<p class='small-font'>Busca por nome do produto no catálogo corporativo, tolerante a acentos e erros de digitação</p>", unsafe_allow_html=True)
+        c1, c2 = st.columns([3, 2])
+        consulta = c1.text_input("📝 Descrição", placeholder="Ex: caneca porcelana")
+        forn = c2.selectbox("Fornecedor (opcional):", [""] + obter_catalogo().fornecedores, key="pesquisa_desc_forn")
+        if consulta.strip():
+            # O índice de texto é sempre em memória; o catálogo só é carregado quando há busca
+            res = buscar_por_descricao(carregar_csv_combinado(), consulta, limite=50, fornecedor=forn or None)
+            if res.empty:
+                st.warning("Nenhum produto encontrado.")
+            else:
+                st.dataframe(
+                    res.reindex(columns=["CODIGO BARRA", "CODIGO", "FORNECEDOR", "DESCRICAO", "SCORE"]),
+                    use_container_width=True,
+                )
+
+    # --- Aba 3: vários códigos de uma vez ---
+    with aba3:
+        pesquisa_em_lote()
+
+
+def pesquisa_por_codigo():
+    st.markdown("<p class='small-font'>Consulta em tempo real na base do Varejo Fácil</p>", unsafe_allow_html=True)
+    cod = st.text_input("📦 Código de barras", placeholder="Ex: 7891234567890")
+    if st.button("🔎 Consultar Produto"):
+        if not cod.strip():
+            st.warning("Digite um código de barras válido.")
+        elif not codigo_valido(cod):
+            st.error("Código de barras inválido: confira os dígitos (o verificador não confere).")
+        else:
+            cliente = ClienteVarejoFacil(
+                cabecalhos={'x-api-key': st.secrets.api.x_api_key, 'Cookie': st.secrets.api.cookie})
+            try:
+                pid, desc = obter_id(cod, cliente)
+            except requests.RequestException as e:
+                erro_api(e)
+                return
+            if pid and desc is not None:
+                st.success("✅ Produto encontrado!")
+                st.markdown(f"<div class='big-font'><strong>📄 Descrição:</strong> {desc}</div>", unsafe_allow_html=True)
+                st.markdown(f"<div class='small-font'>🆔 ID: {pid}</div>", unsafe_allow_html=True)
+                try:
+                    lp = obter_custos(pid, cliente)
+                except requests.RequestException as e:
+                    erro_api(e)
+                    return
+                if lp is not None:
+                    p1 = next((i for i in lp if i.get("lojaId")==1), None)
+                    if p1:
+                        v = p1.get("precoVenda1","N/A"); c = p1.get("custoProduto","N/A")
+                        with st.expander("💰 Preço e Custo"):
+                            st.write(f"**Preço de Venda:** R$ {v:.2f}" if isinstance(v,(int,float)) else f"**Preço de Venda:** {v}")
+                            st.write(f"**Custo:** R$ {c:.2f}" if isinstance(c,(int,float)) else f"**Custo:** {c}")
+                    else:
+                        st.info("Sem dados de preço para esta loja.")
+                else:
+                    st.error("Erro ao consultar preços.")
+            else:
+                st.warning("Produto não encontrado ou dados incompletos.")
+
+def pesquisa_em_lote():
+    st.markdown("<p class='small-font'>Cole uma lista de códigos de barras ou envie uma planilha com a coluna CODIGO BARRA (sem ela, vale a primeira coluna)</p>", unsafe_allow_html=True)
+    c1, c2 = st.columns(2)
+    texto = c1.text_area("Códigos de barras (um por linha)", height=150)
+    arq = c2.file_uploader("📤 Enviar Excel", type=["xlsx"], key="pesquisa_lote")
+    fora_catalogo = c2.checkbox("Consultar também códigos fora do catálogo", value=False)
+
+    codigos = texto.replace(",", " ").replace(";", " ").split()
+    if arq:
+        try:
+            for lote in ler_upload(arq, ["CODIGO BARRA"], coluna_padrao="CODIGO BARRA"):
+                codigos += lote["CODIGO BARRA"].tolist()
+        except UploadInvalido as e:
+            st.error(f"Arquivo inválido: {e}")
+            return
+    codigos = list(dict.fromkeys(c for c in normalizar_cb(codigos) if c))
+    if not codigos:
+        return
+
+    achados, linhas = obter_catalogo().produtos(codigos, "CODIGO BARRA", colunas=["DESCRICAO"])
+    no_catalogo = pd.DataFrame({
+        "CODIGO BARRA": codigos,
+        "NO CATALOGO": achados,
+        "DESCRICAO CATALOGO": "",
+        "VALIDO": cb_valido(codigos),
+    })
+    no_catalogo.loc[achados, "DESCRICAO CATALOGO"] = linhas["DESCRICAO"].astype(str).to_numpy()
+    consultar = no_catalogo["CODIGO BARRA"][
+        no_catalogo["VALIDO"] & (no_catalogo["NO CATALOGO"] | fora_catalogo)].tolist()
+    st.info(f"{len(codigos)} código(s) informados; {len(consultar)} serão consultados na API.")
+
+    if st.button("🔎 Consultar em Lote"):
+        cliente = ClienteVarejoFacil(
+            cabecalhos={'x-api-key': st.secrets.api.x_api_key, 'Cookie': st.secrets.api.cookie})
+        progresso = st.progress(0.0, text="Consultando...")
+        tabela = st.empty()
+        resultados = []
+        for res in consultar_em_lote(consultar, cliente):
+            resultados.append(res)
+            progresso.progress(len(resultados) / len(consultar),
+                               text=f"{len(resultados)} de {len(consultar)} códigos consultados")
+            if len(resultados) % 10 == 0 or len(resultados) == len(consultar):
+                tabela.dataframe(pd.DataFrame(resultados), use_container_width=True)
+
+        df_res = no_catalogo.merge(
+            pd.DataFrame(resultados, columns=["CODIGO BARRA", "ID", "DESCRICAO API", "PRECO VENDA", "CUSTO", "STATUS"]),
+            on="CODIGO BARRA", how="left",
+        )
+        df_res["STATUS"] = df_res["STATUS"].fillna(
+            df_res["VALIDO"].map({True: "Fora do catálogo (API não consultada)", False: "Código de barras inválido"}))
+        df_res = df_res.drop(columns="VALIDO")
+        tabela.dataframe(df_res, use_container_width=True)
+
+        buf = exportar_xlsx(df_res, "Pesquisa")
+        st.download_button("⬇️ Baixar resultado", buf, "pesquisa_produtos.xlsx")
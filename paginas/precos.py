@@ -0,0 +1,242 @@
+from io import BytesIO
+
+import pandas as pd
+import requests
+import streamlit as st
+
+from atualizacao_lote import COLUNAS_MODELO, executar_lote, preparar_lote
+from codigo_barras import codigo_valido
+from diario import obter_diario
+from paginas.comum import acompanhar_tarefa, erro_api, iniciar_tarefa
+from planilhas import UploadInvalido, exportar_xlsx, ler_upload
+from tarefas import ERRO, obter_executor
+from varejo_facil import LOJAS, atualiza, estatisticas_cache, formatar_cb, login, obter_custos, obter_id
+
+
+# ========================= APP 5: ATUALIZADOR DE PREÇOS =========================
+def app_atualizador_precos():
+    st.header("🛠️ Atualizador de Preços")
+    st.markdown("Atualize preço de Venda ou Custo via API Varejo Fácil")
+
+    # Interface de login
+    if "cliente_vf" not in st.session_state:
+        st.subheader("🔐 Login")
+        u = st.text_input("Usuário")
+        p = st.text_input("Senha", type="password")
+        if st.button("Entrar"):
+            with st.spinner("Validando..."):
+                try:
+                    cliente = login(u, p)
+                except requests.RequestException as e:
+                    erro_api(e)
+                    return
+            if cliente:
+                st.session_state.update(cliente_vf=cliente, usuario=u)
+                st.success("✅ Logado!")
+                st.rerun()
+            else:
+                st.error("Credenciais inválidas.")
+    else:
+        st.success(f"Usuário: {st.session_state.usuario}")
+        if st.button("🚪 Sair"):
+            st.session_state.pop("cliente_vf", None)
+            st.session_state.pop("usuario", None)
+            st.rerun()
+
+        with st.expander("📊 Cache de consultas à API"):
+            st.dataframe(pd.DataFrame(estatisticas_cache()).T, use_container_width=True)
+
+        st.divider()
+        aba1, aba2 = st.tabs(["🧍 Individual", "📂 Em Lote"])
+
+        # --- Aba 1: Individual ---
+        with aba1:
+            atualizacao_individual(st.session_state.cliente_vf)
+
+        # --- Aba 2: Em Lote ---
+        with aba2:
+            atualizacao_em_lote(st.session_state.cliente_vf)
+
+
+def atualizacao_individual(cliente):
+    col1, col2 = st.columns(2)
+    metodo = col1.selectbox("Buscar por", ["Código de Barras", "ProdutoId"])
+    tipo = col2.selectbox("Tipo de atualização", ["Venda", "Custo"])
+    entr = st.text_input(f"Insira {metodo}")
+
+    if entr:
+        if metodo == "Código de Barras":
+            cb = formatar_cb(entr)
+            if not codigo_valido(cb):
+                st.error("Código de barras inválido: confira os dígitos (o verificador não confere).")
+                return
+            try:
+                pid, desc = obter_id(cb, cliente)
+            except requests.RequestException as e:
+                erro_api(e)
+                return
+        else:
+            try:
+                pid = int(entr)
+                desc = f"Produto ID {pid}"
+            except:
+                st.error("ID inválido.")
+                return
+
+        if pid:
+            st.write(f"**Produto:** {desc}")
+            try:
+                custos = obter_custos(pid, cliente)
+            except requests.RequestException as e:
+                erro_api(e)
+                return
+            if custos:
+                dfc = pd.DataFrame([{
+                    "Loja": c['lojaId'],
+                    "Preço Venda": c.get("precoVenda1", 0),
+                    "Custo": c.get("custoProduto", 0)
+                } for c in custos if c['lojaId'] in LOJAS])
+                st.dataframe(dfc, use_container_width=True)
+
+                novo = st.number_input("Novo valor (R$)", min_value=0.0, step=0.01)
+
+                if st.button("Atualizar Preço"):
+                    with st.spinner("Atualizando lojas..."):
+                        try:
+                            # Valores atuais, sem cache: o PUT reenvia os campos que não mudam
+                            atuais = obter_custos(pid, cliente, usar_cache=False)
+                        except requests.RequestException as e:
+                            erro_api(e)
+                            return
+                        if not atuais:
+                            st.error("Não foi possível obter preços.")
+                            return
+                        # Só agora o job vai para o diário: nada foi enviado antes deste ponto
+                        diario = obter_diario()
+                        item = {"LINHA": 1, "CODIGO BARRA": entr if metodo == "Código de Barras" else None,
+                                "PRODUTOID": pid, "VALOR": novo, "TIPO": tipo}
+                        job_id = diario.criar_job([item], usuario=st.session_state.usuario,
+                                                  descricao=f"Individual: {desc}")
+                        resultados = atualiza(atuais, novo, tipo, cliente, registro=diario.registro(job_id, 1))
+                    ok = [r["lojaId"] for r in resultados if r["ok"]]
+                    falhas = [r["lojaId"] for r in resultados if not r["ok"]]
+                    status = "OK" if resultados and not falhas else ("PARCIAL" if ok else "ERRO")
+                    diario.registrar_item(job_id, {**item, "DESCRICAO": desc, "STATUS": status})
+                    if ok:
+                        st.success(f"✅ Atualizado em lojas: {', '.join(map(str, ok))}")
+                    if falhas:
+                        st.error(f"❌ Falha nas lojas: {', '.join(map(str, falhas))}")
+                    if not resultados:
+                        st.warning("Nenhuma loja atualizada.")
+                    else:
+                        st.dataframe(pd.DataFrame(resultados).rename(columns={
+                            "lojaId": "Loja", "ok": "OK", "status": "Status HTTP", "erro": "Erro"}),
+                            use_container_width=True)
+            else:
+                st.error("Não foi possível obter preços.")
+        else:
+            st.error("Produto não encontrado.")
+
+
+def atualizacao_em_lote(cliente):
+    c1, c2 = st.columns(2)
+    if c1.button("📥 Baixar Modelo Excel", key="precos_modelo"):
+        modelo = pd.DataFrame(columns=COLUNAS_MODELO)
+        buf = BytesIO()
+        with pd.ExcelWriter(buf, engine='openpyxl') as w:
+            modelo.to_excel(w, index=False, sheet_name="Precos")
+        buf.seek(0)
+        st.download_button("⬇️", buf, "modelo_atualizacao_precos.xlsx")
+    c2.markdown("<p class='small-font'>Preencha CODIGO BARRA <b>ou</b> PRODUTOID, o VALOR e o TIPO (Venda ou Custo).</p>",
+                unsafe_allow_html=True)
+
+    arq = st.file_uploader("📤 Enviar Excel com preços", type=["xlsx"], key="precos_lote")
+    if arq:
+        novo_job(cliente, arq)
+    acompanhar_jobs(cliente)
+
+
+def novo_job(cliente, arq):
+    # A planilha é lida uma vez por arquivo, não a cada rerun
+    lido = st.session_state.get("precos_upload")
+    if lido is None or lido[0] != arq.file_id:
+        try:
+            lotes = list(ler_upload(arq, ["VALOR", "TIPO"], COLUNAS_MODELO))
+        except UploadInvalido as e:
+            st.error(f"Arquivo inválido: {e}")
+            return
+        if not lotes:
+            st.warning("A planilha não tem nenhuma linha de dados.")
+            return
+        lido = st.session_state.precos_upload = (arq.file_id, *preparar_lote(pd.concat(lotes, ignore_index=True)))
+
+    _, itens, invalidas = lido
+    if not invalidas.empty:
+        st.warning(f"⚠️ {len(invalidas)} linha(s) inválidas serão ignoradas.")
+        with st.expander("Ver linhas inválidas"):
+            st.dataframe(invalidas, use_container_width=True)
+    st.info(f"{len(itens)} produto(s) prontos para atualização.")
+
+    if itens and st.button("🚀 Iniciar atualização em lote"):
+        diario = obter_diario()
+        job_id = diario.criar_job(itens, usuario=st.session_state.usuario, descricao=arq.name)
+        iniciar_job(cliente, diario, job_id, itens)
+
+
+def acompanhar_jobs(cliente):
+    diario = obter_diario()
+    usuario = st.session_state.usuario
+    # Job ainda rodando de outra sessão do mesmo usuário (ex.: página recarregada)
+    em_andamento = [t for t in obter_executor().tarefas(dono=usuario) if not t.terminada]
+    if em_andamento and "precos_tarefa" not in st.session_state:
+        st.session_state.precos_tarefa = em_andamento[0].id
+
+    tarefa = acompanhar_tarefa("precos_tarefa", mostrar_parciais=mostrar_parciais)
+    if tarefa and tarefa.status != ERRO:
+        # Relatório com o job inteiro, incluindo itens concluídos em execuções anteriores
+        df_res = pd.DataFrame(diario.resultados(tarefa.chave))
+        st.session_state.precos_relatorio = (tarefa.chave, df_res, exportar_xlsx(df_res, "Resultado"))
+    if "precos_relatorio" in st.session_state:
+        mostrar_relatorio(*st.session_state.precos_relatorio)
+
+    # --- Jobs anteriores: retomar de onde parou ---
+    rodando = {t.chave for t in em_andamento}
+    incompletos = [j for j in diario.jobs(usuario=usuario) if j["ok"] < j["total"] and j["id"] not in rodando]
+    if incompletos:
+        st.divider()
+        st.subheader("⏯️ Retomar atualização interrompida")
+        st.dataframe(pd.DataFrame(incompletos), use_container_width=True)
+        job_id = st.selectbox("Job:", [j["id"] for j in incompletos],
+                              format_func=lambda i: next(f"{j['descricao']} ({j['criado_em'][:16]})"
+                                                         for j in incompletos if j["id"] == i))
+        if st.button("▶️ Retomar (reenvia só o que falhou ou não foi enviado)"):
+            iniciar_job(cliente, diario, job_id, diario.itens_pendentes(job_id))
+
+
+def executar_job(tarefa, cliente, diario, job_id, itens):
+    """Tarefa: envia os itens do job; cada resultado vai para o diário e para a tela."""
+    tarefa.progresso(0, len(itens), "Produtos processados:")
+    for res in executar_lote(itens, cliente, diario=diario, job_id=job_id):
+        tarefa.publicar(res)
+        tarefa.verificar_cancelamento()
+
+
+def iniciar_job(cliente, diario, job_id, itens):
+    st.session_state.pop("precos_relatorio", None)
+    # A chave evita rodar o mesmo job duas vezes ao mesmo tempo
+    iniciar_tarefa("precos_tarefa", f"Atualização em lote ({job_id})", executar_job,
+                   cliente, diario, job_id, itens, dono=st.session_state.usuario, chave=job_id)
+    st.rerun()
+
+
+def mostrar_parciais(resultados):
+    if resultados:
+        st.dataframe(pd.DataFrame(resultados[-25:]), use_container_width=True)
+
+
+def mostrar_relatorio(job_id, df_res, buf):
+    st.dataframe(df_res, use_container_width=True)
+    contagem = df_res["STATUS"].value_counts() if "STATUS" in df_res else pd.Series(dtype=int)
+    st.success(f"✅ Job {job_id}: {contagem.get('OK', 0)} OK, {contagem.get('PARCIAL', 0)} parcial(is), "
+               f"{contagem.get('ERRO', 0)} com erro.")
+    st.download_button("⬇️ Baixar relatório", buf, f"resultado_atualizacao_precos_{job_id}.xlsx")
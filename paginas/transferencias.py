@@ -0,0 +1,114 @@
+import pandas as pd
+import streamlit as st
+
+from catalogo import obter_catalogo
+from conferencia import COLUNAS_PRODUTO, SITUACOES, conciliar, contar_leituras, quantidades
+from planilhas import CABECALHO_TRANSFERENCIA, UploadInvalido, exportar_xlsx, ler_upload
+
+
+# ========================= APP 3: TRANSFERÊNCIAS =========================
+def app_transferencias():
+    st.title("🔁 Transferência Entre Lojas")
+    st.markdown("Utilize esta ferramenta para gerar e conferir transferências entre lojas.")
+
+    st.subheader("📦 Gerar Transferência")
+
+    nome_loja = st.text_input("Nome da Loja Remetente")
+    loja_destino = st.text_input("Nome da Loja Destino")
+
+    st.markdown("Insira os itens para a transferência:")
+
+    data = st.data_editor(
+        pd.DataFrame(columns=["CODIGO BARRA", "CODIGO", "FORNECEDOR", "DESCRICAO", "QTDE"]),
+        num_rows="dynamic",
+        use_container_width=True
+    )
+
+    if st.button("📤 Gerar Planilha de Transferência"):
+        if nome_loja and loja_destino and not data.empty:
+            buf = exportar_xlsx(data, "Transferência", linhas_antes=[
+                ["FORMULÁRIO DE TRANSFERENCIA ENTRE LOJAS"],
+                [],
+                ["LOJA REMETENTE:", nome_loja],
+                ["LOJA DESTINO:", loja_destino],
+                [],
+            ])
+
+            st.success("✅ Planilha de transferência gerada com sucesso!")
+            st.download_button(
+                label="⬇️ Baixar Planilha",
+                data=buf,
+                file_name="FORMULARIO_TRANSFERENCIA.xlsx"
+            )
+        else:
+            st.warning("⚠️ Preencha todos os campos e adicione pelo menos um item.")
+
+    st.divider()
+    st.subheader("📥 Receber / Conferir Transferência")
+
+    c1, c2 = st.columns(2)
+    up_conf = c1.file_uploader("📤 Formulário de Transferência Enviado", type=["xlsx"], key="upload_conf")
+    modo = c2.radio("Contagem recebida:", ["Digitar na tabela", "Planilha de contagem", "Leitura de códigos"])
+
+    if up_conf:
+        try:
+            lotes = list(ler_upload(up_conf, ["CODIGO BARRA", "QTDE"], COLUNAS_PRODUTO, CABECALHO_TRANSFERENCIA))
+        except UploadInvalido as e:
+            st.error(f"❌ Erro ao processar o relatório: {e}")
+            return
+        if not lotes:
+            st.warning("⚠️ Nenhum item encontrado no relatório.")
+            return
+
+        enviado = pd.concat(lotes, ignore_index=True).rename(columns={"QTDE": "ENVIADO"})
+        st.success(f"✅ {len(enviado)} itens carregados do relatório.")
+
+        if modo == "Planilha de contagem":
+            up_rec = c2.file_uploader("📤 Planilha com CODIGO BARRA e QTDE", type=["xlsx"], key="upload_contagem")
+            if not up_rec:
+                return
+            try:
+                lotes_rec = list(ler_upload(up_rec, ["CODIGO BARRA"], ["QTDE"], CABECALHO_TRANSFERENCIA))
+            except UploadInvalido as e:
+                st.error(f"❌ Erro ao processar a contagem: {e}")
+                return
+            if not lotes_rec:
+                st.warning("⚠️ A planilha de contagem está vazia.")
+                return
+            contagem = pd.concat(lotes_rec, ignore_index=True)
+            # Sem QTDE, cada linha é uma leitura
+            recebido = contagem.assign(RECEBIDO=quantidades(contagem["QTDE"]).where(contagem["QTDE"] != "", 1))
+        elif modo == "Leitura de códigos":
+            leituras = c2.text_area("Bipe os produtos recebidos (um código por linha)", height=200)
+            recebido = contar_leituras(leituras.split())
+        else:
+            editado = st.data_editor(
+                enviado.assign(ENVIADO=quantidades(enviado["ENVIADO"]))
+                       .assign(RECEBIDO=lambda d: d["ENVIADO"]),  # Inicialmente assume tudo recebido
+                column_config={"RECEBIDO": st.column_config.NumberColumn("Recebido", min_value=0)},
+                disabled=["CODIGO BARRA", *COLUNAS_PRODUTO, "ENVIADO", "LINHA"],
+                use_container_width=True, hide_index=True,
+            )
+            recebido = editado[["CODIGO BARRA", "RECEBIDO"]]
+
+        conferencia = conciliar(enviado, recebido, obter_catalogo())
+
+        st.subheader("📊 Resumo da Conferência")
+        situacoes = conferencia["SITUACAO"].value_counts()
+        cols = st.columns(len(SITUACOES))
+        for col, situacao in zip(cols, SITUACOES):
+            col.metric(situacao, int(situacoes.get(situacao, 0)))
+        st.dataframe(conferencia, use_container_width=True, hide_index=True)
+
+        divergencias = conferencia[conferencia["SITUACAO"] != "OK"]
+        if not divergencias.empty:
+            st.warning(f"⚠️ Foram encontradas {len(divergencias)} divergência(s).")
+        else:
+            st.success("✅ Tudo conferido corretamente!")
+
+        if st.button("📥 Gerar Relatório de Conferência"):
+            st.download_button(
+                "⬇️ Baixar Conferência",
+                data=exportar_xlsx(conferencia, "Conferência"),
+                file_name="CONFERENCIA_TRANSFERENCIA.xlsx"
+            )
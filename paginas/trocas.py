@@ -0,0 +1,120 @@
+from io import BytesIO
+
+import pandas as pd
+import streamlit as st
+
+from carrinho import Carrinho
+from catalogo import obter_catalogo
+from paginas.comum import (acompanhar_tarefa, editor_carrinho, iniciar_tarefa, mostrar_rejeitados, resolver_upload,
+                           seletor_codigo, upload_novo)
+from planilhas import LINHAS_POR_FOLHA_TROCAS, gerar_formulario_trocas
+from tarefas import CONCLUIDA
+
+
+def gerar_formulario(tarefa, itens, versao):
+    """Tarefa: monta o formulário de ``itens`` (uma cópia do carrinho na ``versao`` dada)."""
+    folhas = -(-itens.groupby("FORNECEDOR", observed=True).size() // LINHAS_POR_FOLHA_TROCAS)
+    resumo = f"{itens['FORNECEDOR'].nunique()} fornecedor(es), {folhas.sum()} folha(s)"
+    return versao, resumo, gerar_formulario_trocas(itens)
+
+
+# ========================= APP 1: TROCAS =========================
+def app_trocas():
+    st.header("♻️ Processo de Trocas")
+    st.divider()
+
+    if "trocas_dados" not in st.session_state:
+        st.session_state.trocas_dados = Carrinho(
+            ["CODIGO BARRA", "CODIGO", "FORNECEDOR", "DESCRICAO", "QUANTIDADE"], "QUANTIDADE")
+    carrinho = st.session_state.trocas_dados
+
+    catalogo = obter_catalogo()
+    fornecedores = catalogo.fornecedores
+
+    aba1, aba2 = st.tabs(["🧍 Troca Individual", "📂 Troca por Lote"])
+
+    # ========================= ABA 1 - INDIVIDUAL =========================
+    with aba1:
+        sel = st.selectbox("Fornecedor:", [""] + fornecedores)
+        if sel:
+            st.subheader("🔍 Buscar Produto para Troca")
+            c1, c2, c3 = st.columns([3, 4, 2])
+            tipo = c1.selectbox("Buscar por:", ["CÓDIGO DE BARRAS", "REF"])
+            col = "CODIGO BARRA" if tipo == "CÓDIGO DE BARRAS" else "CODIGO"
+            ident = seletor_codigo(c2, catalogo, sel, col, tipo, key="trocas_ident")
+            qtd = c3.number_input("Quantidade", 1, step=1, value=1)
+
+            if st.button("🔎 Buscar Produto para Troca"):
+                if not ident:
+                    st.warning("Selecione um identificador válido.")
+                else:
+                    res = catalogo.produto(ident, col, fornecedor=sel)
+                    if res is not None:
+                        carrinho.adicionar({
+                            "CODIGO BARRA": res.get("CODIGO BARRA", ""),
+                            "CODIGO": res.get("CODIGO", ""),
+                            "FORNECEDOR": res.get("FORNECEDOR", ""),
+                            "DESCRICAO": res.get("DESCRICAO", ""),
+                            "QUANTIDADE": qtd
+                        })
+                        st.success(f"Adicionado: {res.get('DESCRICAO', '')}")
+                    else:
+                        st.warning("Produto não encontrado.")
+        else:
+            st.info("Selecione um fornecedor.")
+
+    # ========================= ABA 2 - LOTE =========================
+    with aba2:
+        c1, c2 = st.columns(2)
+
+        if c1.button("📥 Baixar Modelo Excel"):
+            modelo = pd.DataFrame(columns=["CODIGO BARRA", "CODIGO", "QTD"])
+            buf = BytesIO()
+            with pd.ExcelWriter(buf, engine='openpyxl') as writer:
+                modelo.to_excel(writer, index=False, sheet_name="Trocas")
+            buf.seek(0)
+            st.download_button("⬇️ Baixar Modelo", buf, "modelo_troca.xlsx")
+
+        fornecedor_lote = c2.selectbox("Fornecedor para Lote:", fornecedores)
+        tipo_id = st.selectbox("Usar como identificador:", ["CÓDIGO DE BARRAS", "REF"])
+        col_id = "CODIGO BARRA" if tipo_id == "CÓDIGO DE BARRAS" else "CODIGO"
+        arquivo = st.file_uploader("📤 Enviar Excel com Trocas", type=["xlsx"])
+
+        if arquivo and fornecedor_lote and upload_novo(arquivo, col_id, fornecedor_lote):
+            iniciar_tarefa("trocas_tarefa_upload", f"Leitura de {arquivo.name}", resolver_upload,
+                           BytesIO(arquivo.getvalue()), col_id, catalogo, fornecedor_lote)
+
+        tarefa = acompanhar_tarefa("trocas_tarefa_upload")
+        if tarefa and tarefa.status == CONCLUIDA:
+            encontrados, desconhecidos, qtd_invalidas = tarefa.resultado
+            carrinho.adicionar_df(encontrados.rename(columns={"QTD": "QUANTIDADE"}))
+
+            mostrar_rejeitados(desconhecidos, qtd_invalidas)
+            if len(encontrados):
+                st.success(f"✅ {len(encontrados)} produtos adicionados com sucesso.")
+
+    # ========================= RESULTADOS GERAIS =========================
+    if len(carrinho):
+        st.subheader(f"📋 Itens adicionados ({len(carrinho)}):")
+        df_t = editor_carrinho(carrinho, "trocas_editor")
+        cA, cB = st.columns([1, 3])
+
+        if cA.button("🗑️ Remover Último"):
+            rem = carrinho.remover_ultimo()
+            st.warning(f"Removido: {rem['DESCRICAO']}")
+
+        if cB.button("📄 Gerar Formulário"):
+            iniciar_tarefa("trocas_tarefa_formulario", "Geração do formulário", gerar_formulario,
+                           df_t.copy(), carrinho.versao)
+
+        tarefa = acompanhar_tarefa("trocas_tarefa_formulario")
+        if tarefa and tarefa.status == CONCLUIDA:
+            st.session_state.trocas_formulario = tarefa.resultado
+        # Só oferece o formulário se o carrinho não mudou depois de gerado
+        versao, resumo, ex = st.session_state.get("trocas_formulario", (None, None, None))
+        if versao == carrinho.versao:
+            st.success(f"Formulário pronto! {resumo}.")
+            st.download_button("📥 Baixar", ex, "FORMULARIO_TROCA.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    else:
+        st.info("Nenhum item adicionado.")
@@ -0,0 +1,199 @@
+import os
+import re
+from functools import lru_cache
+from io import BytesIO
+from itertools import islice
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from metricas import METRICAS, cronometrado
+
+TAMANHO_MAX_UPLOAD = int(os.environ.get("MIMI_TAMANHO_MAX_UPLOAD_MB", "20")) * 1024 * 1024
+LINHAS_POR_LOTE = 5000
+# O cabeçalho é procurado nas primeiras linhas (formulários têm título em cima)
+MAX_LINHAS_CABECALHO = 20
+MODELO_TROCAS = "FORM-TROCAS.xlsx"
+MODELO_TRANSFERENCIA = "FORMULÁRIO DE TRANSFERENCIA ENTRE LOJAS.xlsx"
+# Cabeçalho do modelo oficial de transferência (linha 7) → nomes das colunas no app
+CABECALHO_TRANSFERENCIA = {"CODIGO DE BARRAS": "CODIGO BARRA", "REF": "CODIGO", "PRODUTO": "DESCRICAO", "QUANT": "QTDE"}
+# Área útil do FORM-TROCAS: linhas 6 a 32, colunas A (código de barras) a D (quantidade)
+PRIMEIRA_LINHA_TROCAS = 6
+LINHAS_POR_FOLHA_TROCAS = 27
+AREA_IMPRESSAO_TROCAS = "A1:D36"
+
+
+class UploadInvalido(ValueError):
+    """Planilha enviada fora do formato esperado; a mensagem vai direto para a tela."""
+
+
+# ========================= LEITURA DE UPLOADS =========================
+def _tamanho(arquivo):
+    tamanho = getattr(arquivo, "size", None)
+    if tamanho is None:
+        posicao = arquivo.tell()
+        tamanho = arquivo.seek(0, os.SEEK_END)
+        arquivo.seek(posicao)
+    return tamanho
+
+
+def _texto(valor):
+    return "" if valor is None else str(valor).strip()
+
+
+def ler_upload(arquivo, obrigatorias, opcionais=(), sinonimos=None, coluna_padrao=None,
+               linhas_por_lote=LINHAS_POR_LOTE, tamanho_max=TAMANHO_MAX_UPLOAD):
+    """Lê um .xlsx enviado em lotes de até ``linhas_por_lote`` linhas.
+
+    A planilha é aberta em modo somente leitura (as linhas são lidas do
+    arquivo sob demanda), então a memória não cresce com o tamanho do
+    upload. Antes de ler os dados, confere o tamanho do arquivo e procura,
+    nas primeiras linhas da aba ativa, um cabeçalho com todas as colunas
+    ``obrigatorias``. Cada lote é um DataFrame de texto com essas colunas,
+    as ``opcionais`` (vazias se ausentes) e ``LINHA``, a linha no Excel;
+    linhas em branco são ignoradas. Levanta ``UploadInvalido``.
+
+    ``sinonimos`` renomeia títulos do cabeçalho (ex.: ``CABECALHO_TRANSFERENCIA``).
+    Com ``coluna_padrao``, uma planilha sem o cabeçalho esperado não é
+    rejeitada: a primeira linha é tomada como cabeçalho e a primeira
+    coluna é lida como ``coluna_padrao``.
+    """
+    sinonimos = sinonimos or {}
+    if _tamanho(arquivo) > tamanho_max:
+        raise UploadInvalido(f"Arquivo maior que o limite de {tamanho_max // (1024 * 1024)} MB.")
+    try:
+        with METRICAS.medir("planilhas.abrir_upload"):
+            wb = load_workbook(arquivo, read_only=True, data_only=True)
+    except Exception as e:
+        raise UploadInvalido(f"Não foi possível abrir a planilha: {e}") from e
+
+    try:
+        aba = wb.active
+        # Alguns ERPs gravam um <dimension> errado (ex.: só A1), que cortaria as colunas
+        aba.reset_dimensions()
+        linhas = aba.iter_rows(values_only=True)
+        for num_cabecalho, linha in enumerate(islice(linhas, MAX_LINHAS_CABECALHO), start=1):
+            cabecalho = [sinonimos.get(c, c) for c in (_texto(v).upper() for v in linha)]
+            if all(c in cabecalho for c in obrigatorias):
+                break
+        else:
+            if not coluna_padrao:
+                raise UploadInvalido("Cabeçalho não encontrado. Colunas esperadas: " + ", ".join(obrigatorias) + ".")
+            linhas = aba.iter_rows(values_only=True)
+            next(linhas, None)
+            num_cabecalho, cabecalho = 1, [coluna_padrao]
+
+        colunas = list(dict.fromkeys([*obrigatorias, *opcionais]))
+        presentes = [c for c in colunas if c in cabecalho]
+        posicoes = [cabecalho.index(c) for c in presentes]
+
+        lote, numeros = [], []
+        for num, linha in enumerate(linhas, start=num_cabecalho + 1):
+            valores = [_texto(linha[i]) if i < len(linha) else "" for i in posicoes]
+            if not any(valores):
+                continue
+            lote.append(valores)
+            numeros.append(num)
+            if len(lote) >= linhas_por_lote:
+                METRICAS.contar("upload.linhas", len(lote))
+                yield _lote(lote, numeros, presentes, colunas)
+                lote, numeros = [], []
+        if lote:
+            METRICAS.contar("upload.linhas", len(lote))
+            yield _lote(lote, numeros, presentes, colunas)
+    finally:
+        wb.close()
+
+
+def _lote(lote, numeros, presentes, colunas):
+    df = pd.DataFrame(lote, columns=presentes).reindex(columns=colunas, fill_value="")
+    df["LINHA"] = numeros
+    return df
+
+
+# ========================= GERAÇÃO =========================
+@lru_cache(maxsize=8)
+def _bytes_modelo(caminho, _modificado_em):
+    with open(caminho, "rb") as f:
+        return f.read()
+
+
+@cronometrado("planilhas.abrir_modelo")
+def abrir_modelo(caminho):
+    """Workbook novo a partir do template, lido do disco uma única vez.
+
+    O conteúdo fica em memória (e é relido só se o arquivo mudar); cada
+    chamada devolve uma cópia independente, pronta para ser preenchida.
+    """
+    return load_workbook(BytesIO(_bytes_modelo(caminho, os.stat(caminho).st_mtime_ns)))
+
+
+def _nome_aba(fornecedor, pagina, paginas, usados):
+    nome = re.sub(r"[\[\]:*?/\\]", " ", str(fornecedor)).strip()[:24] or "SEM FORNECEDOR"
+    if paginas > 1:
+        nome = f"{nome} ({pagina})"
+    base, n = nome, 1
+    while nome.upper() in usados:  # nomes de aba não diferenciam maiúsculas
+        n += 1
+        nome = f"{base[:28]}~{n}"
+    usados.add(nome.upper())
+    return nome
+
+
+@cronometrado("planilhas.formulario_trocas")
+def gerar_formulario_trocas(itens):
+    """Preenche o FORM-TROCAS com todos os ``itens`` e devolve o buffer.
+
+    ``itens`` é um DataFrame com FORNECEDOR, CODIGO BARRA, CODIGO,
+    DESCRICAO e QUANTIDADE. Cada fornecedor ganha suas próprias abas, uma
+    cópia do template para cada página de 27 linhas, tudo na mesma pasta
+    de trabalho.
+    """
+    wb = abrir_modelo(MODELO_TROCAS)
+    modelo = wb.worksheets[0]
+    for ws in wb.worksheets[1:]:
+        wb.remove(ws)
+
+    usados = set()
+    colunas = ["CODIGO BARRA", "CODIGO", "DESCRICAO", "QUANTIDADE"]
+    for fornecedor, grupo in itens.groupby("FORNECEDOR", sort=True, observed=True):
+        linhas = grupo[colunas].astype(object).where(grupo[colunas].notna(), None).to_numpy().tolist()
+        paginas = -(-len(linhas) // LINHAS_POR_FOLHA_TROCAS)
+        for pagina in range(paginas):
+            ws = wb.copy_worksheet(modelo)
+            ws.title = _nome_aba(fornecedor, pagina + 1, paginas, usados)
+            ws.print_area = AREA_IMPRESSAO_TROCAS
+            ws["C3"] = fornecedor
+            inicio = pagina * LINHAS_POR_FOLHA_TROCAS
+            for r, valores in enumerate(linhas[inicio:inicio + LINHAS_POR_FOLHA_TROCAS], start=PRIMEIRA_LINHA_TROCAS):
+                for c, valor in enumerate(valores, start=1):
+                    ws.cell(row=r, column=c, value=valor)
+    wb.remove(modelo)
+
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+@cronometrado("planilhas.exportar_xlsx")
+def exportar_xlsx(df, nome_aba, linhas_antes=()):
+    """Grava ``df`` num .xlsx em modo write-only e devolve o buffer.
+
+    As linhas vão direto para o arquivo sem montar as células em memória,
+    então exportações grandes custam pouco tempo e memória. ``linhas_antes``
+    são escritas acima do cabeçalho (título, lojas etc.).
+    """
+    METRICAS.contar("exportacao.linhas", len(df))
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(nome_aba)
+    for linha in linhas_antes:
+        ws.append(list(linha))
+    ws.append([str(c) for c in df.columns])
+    valores = df.astype(object).where(df.notna(), None)
+    for linha in valores.itertuples(index=False, name=None):
+        ws.append(linha)
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
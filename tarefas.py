@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from metricas import METRICAS
+
+MAX_TAREFAS_SIMULTANEAS = int(os.environ.get("MIMI_TAREFAS_SIMULTANEAS", "4"))
+# Por quanto tempo (s) uma tarefa terminada continua consultável
+RETENCAO_TAREFAS = int(os.environ.get("MIMI_RETENCAO_TAREFAS", "3600"))
+
+PENDENTE, EXECUTANDO, CONCLUIDA, ERRO, CANCELADA = "PENDENTE", "EXECUTANDO", "CONCLUIDA", "ERRO", "CANCELADA"
+TERMINADAS = (CONCLUIDA, ERRO, CANCELADA)
+
+
+class Cancelada(Exception):
+    pass
+
+
+class Tarefa:
+    """Estado de um trabalho em segundo plano.
+
+    A função que roda no pool informa o andamento com ``progresso`` e
+    ``publicar``; a tela lê ``status``, ``fracao``, ``parciais()`` e, ao
+    final, ``resultado`` ou ``erro``, em qualquer rerun.
+    """
+
+    def __init__(self, descricao, dono="", chave=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.descricao = descricao
+        self.dono = dono
+        self.chave = chave
+        self.status = PENDENTE
+        self.feito = 0
+        self.total = None
+        self.mensagem = ""
+        self.resultado = None
+        self.erro = None
+        self.criada_em = time.time()
+        self.iniciada_em = None
+        self.terminada_em = None
+        self._parciais = []
+        self._cancelar = threading.Event()
+        self._trava = threading.Lock()
+
+    # --- lado do trabalho ---
+    def progresso(self, feito, total=None, mensagem=None):
+        with self._trava:
+            self.feito = feito
+            if total is not None:
+                self.total = total
+            if mensagem is not None:
+                self.mensagem = mensagem
+
+    def publicar(self, item):
+        """Guarda um resultado parcial e avança o progresso em um."""
+        with self._trava:
+            self._parciais.append(item)
+            self.feito += 1
+
+    def verificar_cancelamento(self):
+        if self._cancelar.is_set():
+            raise Cancelada()
+
+    # --- lado da tela ---
+    @property
+    def terminada(self):
+        return self.status in TERMINADAS
+
+    @property
+    def fracao(self):
+        if self.status == CONCLUIDA:
+            return 1.0
+        return min(self.feito / self.total, 1.0) if self.total else 0.0
+
+    def parciais(self):
+        with self._trava:
+            return list(self._parciais)
+
+    def texto_progresso(self):
+        if self.status == PENDENTE:
+            return "Aguardando na fila..."
+        texto = f"{self.feito} de {self.total}" if self.total else f"{self.feito}"
+        return f"{self.mensagem} {texto}".strip() if self.mensagem else f"{texto} processados"
+
+    def cancelar(self):
+        self._cancelar.set()
+
+
+class ExecutorTarefas:
+    """Pool de threads do processo para trabalhos longos das telas.
+
+    O script do Streamlit só submete a tarefa e guarda o ``id`` na sessão;
+    o trabalho roda uma única vez no pool enquanto a página continua
+    respondendo, e o estado fica aqui, disponível para os reruns (e para
+    outras sessões do mesmo ``dono``) até ``RETENCAO_TAREFAS`` depois de
+    terminar. A função da tarefa não deve chamar ``st.*``.
+    """
+
+    def __init__(self, max_workers=MAX_TAREFAS_SIMULTANEAS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tarefa")
+        self._tarefas = {}
+        self._trava = threading.Lock()
+
+    def submeter(self, descricao, func, *args, dono="", chave=None, **kwargs):
+        """Agenda ``func(tarefa, *args, **kwargs)``; o retorno vira ``tarefa.resultado``.
+
+        Se já houver uma tarefa não terminada do mesmo ``dono`` com a mesma
+        ``chave``, ela é devolvida em vez de iniciar o trabalho de novo.
+        """
+        with self._trava:
+            self._expirar()
+            if chave is not None:
+                existente = next((t for t in self._tarefas.values()
+                                  if t.chave == chave and t.dono == dono and not t.terminada), None)
+                if existente:
+                    return existente
+            tarefa = Tarefa(descricao, dono=dono, chave=chave)
+            self._tarefas[tarefa.id] = tarefa
+        METRICAS.contar("tarefas.submetidas")
+        self._pool.submit(self._executar, tarefa, func, args, kwargs)
+        return tarefa
+
+    def _executar(self, tarefa, func, args, kwargs):
+        if tarefa._cancelar.is_set():
+            tarefa.status = CANCELADA
+        else:
+            tarefa.status = EXECUTANDO
+            tarefa.iniciada_em = time.time()
+            try:
+                with METRICAS.medir(f"tarefa.{func.__name__}"):
+                    tarefa.resultado = func(tarefa, *args, **kwargs)
+            except Cancelada:
+                tarefa.status = CANCELADA
+            except Exception as e:
+                tarefa.erro = str(e) or type(e).__name__
+                tarefa.status = ERRO
+            else:
+                tarefa.status = CONCLUIDA
+        tarefa.terminada_em = time.time()
+        METRICAS.contar(f"tarefas.{tarefa.status.lower()}")
+
+    def _expirar(self):
+        limite = time.time() - RETENCAO_TAREFAS
+        for id_ in [i for i, t in self._tarefas.items() if t.terminada and t.terminada_em < limite]:
+            del self._tarefas[id_]
+
+    def obter(self, id_):
+        with self._trava:
+            return self._tarefas.get(id_)
+
+    def tarefas(self, dono=None):
+        """Tarefas ainda retidas (do ``dono``, se informado), da mais recente para a mais antiga."""
+        with self._trava:
+            lista = [t for t in self._tarefas.values() if dono is None or t.dono == dono]
+        return sorted(lista, key=lambda t: t.criada_em, reverse=True)
+
+
+@lru_cache(maxsize=None)
+def obter_executor():
+    return ExecutorTarefas()
@@ -0,0 +1,55 @@
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+import varejo_facil
+from benchmarks.api_simulada import ApiSimulada
+from catalogo import CatalogoMemoria, IndiceCatalogo, _tipo_pandas, atualizar_snapshot
+from catalogo_sqlite import CatalogoSQLite
+
+# Fornecedores fora de ordem e um código de barras repetido dentro de ALFA
+# e entre ALFA e BETA, para testar a ordenação e a regra da primeira linha.
+LINHAS_CATALOGO = [
+    ("BETA", "7894900011517", "B-01", "SABONETE BETA", "beta.xlsx"),
+    ("ALFA", "7891234567895", "12E4", "CANETA ALFA", "alfa.xlsx"),
+    ("ALFA", "12345670", "10.00", "LAPIS ALFA", "alfa.xlsx"),
+    ("ALFA", "12345670", "A-99", "LAPIS ALFA DUPLICADO", "alfa.xlsx"),
+    ("BETA", "7891234567895", "B-02", "CANETA BETA", "beta.xlsx"),
+]
+
+
+def escrever_csv(caminho, linhas=LINHAS_CATALOGO):
+    pd.DataFrame(linhas, columns=["FORNECEDOR", "CODIGO BARRA", "CODIGO", "DESCRICAO", "__ORIGEM_PLANILHA__"]) \
+        .to_csv(caminho, index=False)
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Snapshot Arrow do catálogo de teste, gerado pelo mesmo caminho do app (file://)."""
+    csv = tmp_path / "cad_concatenado.csv"
+    escrever_csv(csv)
+    return atualizar_snapshot(csv.as_uri(), tmp_path / "cache")
+
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def catalogo(request, snapshot):
+    """Os dois backends de ``obter_catalogo`` sobre o mesmo snapshot."""
+    if request.param == "sqlite":
+        return CatalogoSQLite(snapshot)
+    df = feather.read_table(snapshot).to_pandas(types_mapper=_tipo_pandas)
+    return CatalogoMemoria(df, IndiceCatalogo(df))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """API simulada do Varejo Fácil, sem latência, apontada por ``varejo_facil.URL_BASE``."""
+    with ApiSimulada(latencia=0) as api:
+        monkeypatch.setattr(varejo_facil, "URL_BASE", api.url)
+        yield api
+
+
+@pytest.fixture
+def cliente(api):
+    cliente = varejo_facil.ClienteVarejoFacil("usuario", "senha")
+    assert cliente.login() == api.token
+    return cliente
@@ -0,0 +1,62 @@
+import pytest
+
+from atualizacao_lote import executar_lote
+from diario import Diario
+
+ITENS = [
+    {"LINHA": 2, "CODIGO BARRA": None, "PRODUTOID": 111111, "VALOR": 9.9, "TIPO": "Venda"},
+    {"LINHA": 3, "CODIGO BARRA": None, "PRODUTOID": 222222, "VALOR": 4.5, "TIPO": "Custo"},
+]
+
+
+@pytest.fixture
+def diario(tmp_path):
+    return Diario(tmp_path / "diario.sqlite3")
+
+
+def puts(api, desde=0):
+    return sorted(caminho for metodo, caminho in api.historico[desde:] if metodo == "PUT")
+
+
+def executar(itens, cliente, diario, job_id):
+    return {r["LINHA"]: r for r in executar_lote(itens, cliente, diario=diario, job_id=job_id)}
+
+
+def test_retomar_reenvia_so_as_lojas_que_falharam(api, cliente, diario):
+    job_id = diario.criar_job(ITENS, usuario="usuario")
+    # id do preço na API simulada: produto * 10 + loja
+    api.falhar(400, "PUT", "/api/v1/produto/precos/1111112")
+
+    resultados = executar(ITENS, cliente, diario, job_id)
+    assert resultados[2]["STATUS"] == "PARCIAL"
+    assert resultados[2]["LOJAS OK"] == "1, 5"
+    assert resultados[2]["LOJAS COM FALHA"] == "2 (400)"
+    assert resultados[3]["STATUS"] == "OK"
+    assert diario.itens_pendentes(job_id) == [ITENS[0]]
+
+    inicio = len(api.historico)
+    resultados = executar(diario.itens_pendentes(job_id), cliente, diario, job_id)
+    assert puts(api, inicio) == ["/api/v1/produto/precos/1111112"]
+    assert resultados[2]["STATUS"] == "OK"
+    assert diario.itens_pendentes(job_id) == []
+    assert [r["STATUS"] for r in diario.resultados(job_id)] == ["OK", "OK"]
+
+
+def test_reexecutar_job_concluido_nao_reenvia_nada(api, cliente, diario):
+    job_id = diario.criar_job(ITENS)
+    executar(ITENS, cliente, diario, job_id)
+    assert puts(api) == [
+        "/api/v1/produto/custos/2222221", "/api/v1/produto/custos/2222222", "/api/v1/produto/custos/2222225",
+        "/api/v1/produto/precos/1111111", "/api/v1/produto/precos/1111112", "/api/v1/produto/precos/1111115",
+    ]
+
+    inicio = len(api.historico)
+    resultados = executar(ITENS, cliente, diario, job_id)
+    assert puts(api, inicio) == []
+    assert {r["STATUS"] for r in resultados.values()} == {"OK"}
+
+
+def test_sem_diario_nao_pula_lojas(api, cliente):
+    list(executar_lote(ITENS[:1], cliente))
+    list(executar_lote(ITENS[:1], cliente))
+    assert len(puts(api)) == 6
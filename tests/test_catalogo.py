@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pyarrow.feather as feather
+import pytest
+
+from catalogo import atualizar_snapshot
+from conftest import LINHAS_CATALOGO, escrever_csv
+from metricas import METRICAS
+
+
+def contador(nome):
+    return METRICAS.contadores().get(nome, 0)
+
+
+def ler(arquivo):
+    return feather.read_table(arquivo).to_pandas()
+
+
+@pytest.fixture
+def origem(tmp_path):
+    csv = tmp_path / "cad_concatenado.csv"
+    escrever_csv(csv)
+    return csv
+
+
+def test_snapshot_normaliza_e_ordena(origem, tmp_path):
+    df = ler(atualizar_snapshot(origem.as_uri(), tmp_path / "cache"))
+    assert df["FORNECEDOR"].tolist() == ["ALFA", "ALFA", "ALFA", "BETA", "BETA"]
+    assert df["CODIGO BARRA"].tolist()[1] == "0000012345670"
+    # REF fica como veio: nada de limpeza de notação científica ou de ".00"
+    assert df["CODIGO"].tolist()[:2] == ["12E4", "10.00"]
+
+
+def test_snapshot_nao_consulta_origem_dentro_do_intervalo(origem, tmp_path):
+    pasta = tmp_path / "cache"
+    arquivo = atualizar_snapshot(origem.as_uri(), pasta)
+    downloads, nao_modificados = contador("catalogo.download"), contador("catalogo.nao_modificado")
+    origem.unlink()
+
+    assert atualizar_snapshot(origem.as_uri(), pasta) == arquivo
+    assert contador("catalogo.download") == downloads
+    assert contador("catalogo.nao_modificado") == nao_modificados
+
+
+def test_snapshot_so_reprocessa_quando_a_origem_muda(origem, tmp_path):
+    pasta = tmp_path / "cache"
+    arquivo = atualizar_snapshot(origem.as_uri(), pasta)
+    gravado_em = arquivo.stat().st_mtime_ns
+
+    nao_modificados = contador("catalogo.nao_modificado")
+    atualizar_snapshot(origem.as_uri(), pasta, forcar=True)
+    assert contador("catalogo.nao_modificado") == nao_modificados + 1
+    assert arquivo.stat().st_mtime_ns == gravado_em
+
+    escrever_csv(origem, LINHAS_CATALOGO + [("GAMA", "7891234567895", "G-01", "CANETA GAMA", "gama.xlsx")])
+    futuro = time.time() + 60
+    os.utime(origem, (futuro, futuro))
+    downloads = contador("catalogo.download")
+    atualizar_snapshot(origem.as_uri(), pasta, forcar=True)
+    assert contador("catalogo.download") == downloads + 1
+    assert "GAMA" in ler(arquivo)["FORNECEDOR"].tolist()
+
+
+def test_snapshot_usa_o_ultimo_valido_com_origem_fora_do_ar(origem, tmp_path):
+    pasta = tmp_path / "cache"
+    arquivo = atualizar_snapshot(origem.as_uri(), pasta)
+    origem.unlink()
+
+    assert atualizar_snapshot(origem.as_uri(), pasta, forcar=True) == arquivo
+    assert len(ler(arquivo)) == len(LINHAS_CATALOGO)
+
+
+def test_snapshot_sem_copia_local_e_origem_fora_do_ar_levanta(tmp_path):
+    with pytest.raises(urllib.error.URLError):
+        atualizar_snapshot((tmp_path / "inexistente.csv").as_uri(), tmp_path / "cache")
+
+
+class _OrigemHttp(BaseHTTPRequestHandler):
+    """Responde o CSV com ETag e 304 quando o If-None-Match confere."""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.condicionais.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(self.server.corpo)))
+        self.end_headers()
+        self.wfile.write(self.server.corpo)
+
+
+@pytest.fixture
+def servidor(origem):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _OrigemHttp)
+    srv.etag, srv.corpo, srv.condicionais = '"v1"', origem.read_bytes(), []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_snapshot_304_mantem_o_arquivo(servidor, tmp_path):
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/cad_concatenado.csv"
+    pasta = tmp_path / "cache"
+    arquivo = atualizar_snapshot(url, pasta)
+    gravado_em = arquivo.stat().st_mtime_ns
+
+    nao_modificados = contador("catalogo.nao_modificado")
+    atualizar_snapshot(url, pasta, forcar=True)
+    assert servidor.condicionais == [None, '"v1"']
+    assert contador("catalogo.nao_modificado") == nao_modificados + 1
+    assert arquivo.stat().st_mtime_ns == gravado_em
+
+    servidor.etag, servidor.corpo = '"v2"', servidor.corpo + b"GAMA,7891234567895,G-01,CANETA GAMA,gama.xlsx\n"
+    atualizar_snapshot(url, pasta, forcar=True)
+    assert "GAMA" in ler(arquivo)["FORNECEDOR"].tolist()
@@ -0,0 +1,59 @@
+import pytest
+
+from codigo_barras import cb_valido, codigo_valido, limpar_texto, normalizar_cb, normalizar_codigo
+
+CASOS_NORMALIZACAO = [
+    ("7891234567895", "7891234567895"),
+    (" 7891234567895 ", "7891234567895"),
+    ("7891234567895.0", "7891234567895"),
+    ("7891234567895.000", "7891234567895"),
+    ("7.891234567895E+12", "7891234567895"),
+    ("7,891234567895E+12", "7,891234567895E+12"),
+    ("07891234567895", "7891234567895"),  # GTIN-14 com zero à esquerda
+    ("17891234567892", "17891234567892"),  # GTIN-14 de verdade
+    ("12345670", "0000012345670"),  # EAN-8
+    ("789123456789", "0789123456789"),  # UPC-A
+    ("000000", ""),
+    ("", ""),
+    ("nan", ""),
+    ("None", ""),
+    (None, ""),
+    ("ABC-123", "ABC-123"),
+    ("789123456789512345", "789123456789512345"),  # longo demais: não mexe
+    ("７８９１２３４５６７８９５", "７８９１２３４５６７８９５"),  # dígitos não ASCII
+]
+
+
+@pytest.mark.parametrize("valor, esperado", CASOS_NORMALIZACAO)
+def test_normalizar_cb(valor, esperado):
+    assert normalizar_cb([valor]).tolist() == [esperado]
+
+
+@pytest.mark.parametrize("valor, esperado", CASOS_NORMALIZACAO)
+def test_normalizar_codigo_igual_ao_vetorizado(valor, esperado):
+    assert normalizar_codigo(valor) == esperado
+
+
+CASOS_VALIDACAO = [
+    ("7891234567895", True),
+    ("7891234567894", False),  # dígito verificador errado
+    ("7.891234567895E+12", True),
+    ("12345670", True),
+    ("12345675", False),
+    ("17891234567892", True),
+    ("0000000000000", False),
+    ("0000000000017", False),  # poucos dígitos significativos (PLU)
+    ("ABC-123", False),
+    ("", False),
+    (None, False),
+]
+
+
+@pytest.mark.parametrize("valor, esperado", CASOS_VALIDACAO)
+def test_cb_valido(valor, esperado):
+    assert cb_valido([valor]).tolist() == [esperado]
+    assert codigo_valido(valor) is esperado
+
+
+def test_limpar_texto_mantem_referencias():
+    assert limpar_texto([" 12E4 ", "10.00", "nan", None, "A-1"]).tolist() == ["12E4", "10.00", "", "", "A-1"]
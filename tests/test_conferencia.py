@@ -0,0 +1,55 @@
+import pandas as pd
+
+from conferencia import conciliar, contar_leituras
+
+
+def por_codigo(res):
+    return res.set_index("CODIGO BARRA")
+
+
+def test_situacoes_e_ordem():
+    enviado = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895", "7894900011517", "12345670", "17891234567892"],
+        "ENVIADO": ["2", "5", "1", "3"],
+    })
+    recebido = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895", "7894900011517", "17891234567892", "7896543210982"],
+        "RECEBIDO": [2, 3, 4, 1],
+    })
+    res = conciliar(enviado, recebido)
+
+    assert res["SITUACAO"].tolist() == ["FALTANDO", "SOBRANDO", "A MENOS", "A MAIS", "OK"]
+    linhas = por_codigo(res)
+    assert linhas.loc["0000012345670", ["ENVIADO", "RECEBIDO", "DIVERGENCIA"]].tolist() == [1, 0, -1]
+    assert linhas.loc["7896543210982", ["ENVIADO", "RECEBIDO", "DIVERGENCIA"]].tolist() == [0, 1, 1]
+    assert linhas.loc["7894900011517", "DIVERGENCIA"] == -2
+
+
+def test_codigos_repetidos_e_sujos_sao_somados():
+    enviado = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895", "7891234567895.0", "07891234567895", "", None],
+        "ENVIADO": ["1", "2,0", "x", "9", "9"],
+    })
+    recebido = contar_leituras(["7891234567895", " 7891234567895", "7.891234567895E+12"])
+    res = conciliar(enviado, recebido)
+
+    assert res["CODIGO BARRA"].tolist() == ["7891234567895"]
+    assert res[["ENVIADO", "RECEBIDO", "SITUACAO"]].iloc[0].tolist() == [3, 3, "OK"]
+
+
+def test_completa_produto_pelo_catalogo(catalogo):
+    enviado = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895", "12345670"],
+        "DESCRICAO": ["DESCRICAO DA PLANILHA", ""],
+        "ENVIADO": [1, 1],
+    })
+    recebido = pd.DataFrame({"CODIGO BARRA": ["7891234567895", "12345670", "7894900011517", "9999999999999"],
+                             "RECEBIDO": [1, 1, 1, 1]})
+    linhas = por_codigo(conciliar(enviado, recebido, catalogo))
+
+    # O que veio na planilha prevalece; o vazio vem do catálogo (primeira linha do código)
+    assert linhas.loc["7891234567895", "DESCRICAO"] == "DESCRICAO DA PLANILHA"
+    assert linhas.loc["7891234567895", "FORNECEDOR"] == "ALFA"
+    assert linhas.loc["0000012345670", ["CODIGO", "DESCRICAO"]].tolist() == ["10.00", "LAPIS ALFA"]
+    assert linhas.loc["7894900011517", ["FORNECEDOR", "DESCRICAO"]].tolist() == ["BETA", "SABONETE BETA"]
+    assert linhas.loc["9999999999999", ["FORNECEDOR", "DESCRICAO"]].tolist() == ["", ""]
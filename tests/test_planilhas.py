@@ -0,0 +1,69 @@
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from conferencia import COLUNAS_PRODUTO
+from planilhas import (CABECALHO_TRANSFERENCIA, MODELO_TRANSFERENCIA, UploadInvalido, exportar_xlsx,
+                       ler_upload)
+
+MODELO = Path(__file__).resolve().parents[1] / MODELO_TRANSFERENCIA
+
+
+def salvar(wb):
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def ler(arquivo, *args, **kwargs):
+    return pd.concat(ler_upload(arquivo, *args, **kwargs), ignore_index=True)
+
+
+def test_le_o_modelo_oficial_de_transferencia():
+    wb = load_workbook(MODELO)
+    aba = wb.active
+    for linha, valores in enumerate([
+        (7891234567895, "12E4", "ALFA", "CANETA ALFA", 3),
+        ("07894900011517", "B-01", "BETA", "SABONETE BETA", "2,5"),
+    ], start=8):
+        for coluna, valor in enumerate(valores, start=1):
+            aba.cell(row=linha, column=coluna, value=valor)
+
+    df = ler(salvar(wb), ["CODIGO BARRA", "QTDE"], COLUNAS_PRODUTO, CABECALHO_TRANSFERENCIA)
+    assert df.to_dict("records") == [
+        {"CODIGO BARRA": "7891234567895", "QTDE": "3", "CODIGO": "12E4", "FORNECEDOR": "ALFA",
+         "DESCRICAO": "CANETA ALFA", "LINHA": 8},
+        {"CODIGO BARRA": "07894900011517", "QTDE": "2,5", "CODIGO": "B-01", "FORNECEDOR": "BETA",
+         "DESCRICAO": "SABONETE BETA", "LINHA": 9},
+    ]
+
+
+def test_modelo_oficial_sem_sinonimos_nao_tem_cabecalho():
+    with MODELO.open("rb") as arquivo, pytest.raises(UploadInvalido, match="Cabeçalho não encontrado"):
+        list(ler_upload(arquivo, ["CODIGO BARRA", "QTDE"]))
+
+
+def test_le_o_formulario_gerado_pelo_app():
+    itens = pd.DataFrame({"CODIGO BARRA": ["7891234567895"], "CODIGO": ["12E4"], "FORNECEDOR": ["ALFA"],
+                          "DESCRICAO": ["CANETA ALFA"], "QTDE": [3]})
+    buf = exportar_xlsx(itens, "Transferência", linhas_antes=[["FORMULÁRIO DE TRANSFERENCIA ENTRE LOJAS"], [],
+                                                                 ["LOJA REMETENTE:", "A"], ["LOJA DESTINO:", "B"], []])
+    df = ler(buf, ["CODIGO BARRA", "QTDE"], COLUNAS_PRODUTO, CABECALHO_TRANSFERENCIA)
+    assert df[["CODIGO BARRA", "QTDE", "LINHA"]].to_dict("records") == [
+        {"CODIGO BARRA": "7891234567895", "QTDE": "3", "LINHA": 7}]
+
+
+def test_sem_cabecalho_usa_a_primeira_coluna():
+    wb = Workbook()
+    for linha in [("CODIGOS", "OBS"), ("7891234567895", "x"), (None, None), ("12345670", "")]:
+        wb.active.append(linha)
+
+    df = ler(salvar(wb), ["CODIGO BARRA"], coluna_padrao="CODIGO BARRA")
+    assert df.to_dict("records") == [{"CODIGO BARRA": "7891234567895", "LINHA": 2},
+                                     {"CODIGO BARRA": "12345670", "LINHA": 4}]
+    with pytest.raises(UploadInvalido):
+        list(ler_upload(salvar(wb), ["CODIGO BARRA"]))
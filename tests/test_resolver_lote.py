@@ -0,0 +1,81 @@
+import pandas as pd
+
+from catalogo import resolver_lote
+
+
+def test_resolve_codigos_de_barras_sujos_e_quantidades(catalogo):
+    df_up = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895.0", " 07894900011517", "7.891234567895E+12", "9999999999999", "12345670"],
+        "QTD": ["2", "3.0", "1", "4", " 5 "],
+    })
+    encontrados, desconhecidos, qtd_invalidas = resolver_lote(df_up, "CODIGO BARRA", catalogo)
+
+    assert encontrados["CODIGO BARRA"].tolist() == ["7891234567895", "7894900011517", "7891234567895", "0000012345670"]
+    assert encontrados["QTD"].tolist() == [2, 3, 1, 5]
+    assert desconhecidos["LINHA"].tolist() == [5]
+    assert qtd_invalidas.empty
+
+
+def test_codigo_repetido_no_catalogo_usa_a_primeira_linha(catalogo):
+    df_up = pd.DataFrame({"CODIGO BARRA": ["12345670", "7891234567895"], "QTD": ["1", "1"]})
+    encontrados, _, _ = resolver_lote(df_up, "CODIGO BARRA", catalogo)
+    assert encontrados["DESCRICAO"].tolist() == ["LAPIS ALFA", "CANETA ALFA"]
+
+
+def test_restringe_ao_fornecedor(catalogo):
+    df_up = pd.DataFrame({"CODIGO BARRA": ["7891234567895", "7894900011517", "12345670"], "QTD": ["1", "1", "1"]})
+    encontrados, desconhecidos, _ = resolver_lote(df_up, "CODIGO BARRA", catalogo, fornecedor="BETA")
+
+    assert encontrados["DESCRICAO"].tolist() == ["CANETA BETA", "SABONETE BETA"]
+    assert set(encontrados["FORNECEDOR"]) == {"BETA"}
+    assert desconhecidos["LINHA"].tolist() == [4]
+
+
+def test_referencias_comparadas_sem_limpeza_numerica(catalogo):
+    df_up = pd.DataFrame({"CODIGO": ["12E4", "120000", " 10.00 ", "10"], "QTD": ["1", "1", "1", "1"]})
+    encontrados, desconhecidos, _ = resolver_lote(df_up, "CODIGO", catalogo, fornecedor="ALFA")
+
+    assert encontrados["DESCRICAO"].tolist() == ["CANETA ALFA", "LAPIS ALFA"]
+    assert desconhecidos["CODIGO"].tolist() == ["120000", "10"]
+
+
+def test_quantidades_invalidas_e_linhas_do_excel(catalogo):
+    df_up = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895"] * 7,
+        "QTD": ["0", "-1", "1.5", "abc", "", None, "1"],
+    })
+    encontrados, desconhecidos, qtd_invalidas = resolver_lote(df_up, "CODIGO BARRA", catalogo)
+
+    assert qtd_invalidas["LINHA"].tolist() == [2, 3, 4, 5, 6, 7]
+    assert encontrados["QTD"].tolist() == [1]
+    assert desconhecidos.empty
+
+
+def test_quantidades_fora_do_intervalo_ou_em_notacao_cientifica(catalogo):
+    df_up = pd.DataFrame({
+        "CODIGO BARRA": ["7891234567895"] * 7,
+        "QTD": ["1e20", "1E2", "7891234567895", "100000", "2147483648", "99999", "12.00"],
+    })
+    encontrados, _, qtd_invalidas = resolver_lote(df_up, "CODIGO BARRA", catalogo)
+
+    assert qtd_invalidas["LINHA"].tolist() == [2, 3, 4, 5, 6]
+    assert encontrados["QTD"].tolist() == [99999, 12]
+
+
+def test_mantem_a_linha_vinda_do_upload(catalogo):
+    df_up = pd.DataFrame({"CODIGO BARRA": ["9999999999999", "7891234567895"], "QTD": ["1", "x"], "LINHA": [10, 12]},
+                         index=[7, 8])
+    _, desconhecidos, qtd_invalidas = resolver_lote(df_up, "CODIGO BARRA", catalogo)
+    assert desconhecidos["LINHA"].tolist() == [10]
+    assert qtd_invalidas["LINHA"].tolist() == [12]
+
+
+def test_sem_coluna_de_codigo_ou_quantidade(catalogo):
+    encontrados, desconhecidos, qtd_invalidas = resolver_lote(
+        pd.DataFrame({"OUTRA": ["a", "b"]}), "CODIGO BARRA", catalogo)
+    assert encontrados.empty and desconhecidos.empty
+    assert qtd_invalidas["LINHA"].tolist() == [2, 3]
+
+    encontrados, desconhecidos, _ = resolver_lote(pd.DataFrame({"QTD": ["1"]}), "CODIGO BARRA", catalogo)
+    assert encontrados.empty
+    assert desconhecidos["LINHA"].tolist() == [2]
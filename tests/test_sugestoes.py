@@ -0,0 +1,35 @@
+import pytest
+
+from catalogo import codigo_completo
+
+
+@pytest.mark.parametrize("digitado", ["12345670", " 12345670 ", "0000012345670", "00000012345670", "12345670.0"])
+def test_codigo_de_barras_completo_acha_a_chave_com_zeros(catalogo, digitado):
+    sugestoes, total = catalogo.sugestoes("ALFA", "CODIGO BARRA", digitado)
+    assert sugestoes == [("0000012345670", "LAPIS ALFA")]
+    assert total == 1
+
+
+def test_prefixo_continua_funcionando(catalogo):
+    assert catalogo.sugestoes("ALFA", "CODIGO BARRA", "789")[0] == [("7891234567895", "CANETA ALFA")]
+    assert catalogo.sugestoes("ALFA", "CODIGO BARRA", "00000")[0] == [("0000012345670", "LAPIS ALFA")]
+    assert catalogo.sugestoes("ALFA", "CODIGO BARRA", "")[1] == 2
+    assert catalogo.sugestoes("BETA", "CODIGO BARRA", "12345670") == ([], 0)
+
+
+def test_referencias_nao_sao_normalizadas(catalogo):
+    assert catalogo.sugestoes("ALFA", "CODIGO", "12E4")[0] == [("12E4", "CANETA ALFA")]
+    assert catalogo.sugestoes("ALFA", "CODIGO", "12345670") == ([], 0)
+
+
+@pytest.mark.parametrize("digitado, esperado", [
+    ("12345670", "0000012345670"),
+    ("789123456789", "0789123456789"),
+    ("07891234567895", "7891234567895"),
+    ("7891234567895", None),  # já é a chave: o prefixo acha
+    ("1234567", None),  # incompleto
+    ("ABC12345", None),
+])
+def test_codigo_completo(digitado, esperado):
+    assert codigo_completo(digitado, "CODIGO BARRA") == esperado
+    assert codigo_completo(digitado, "CODIGO") is None
@@ -0,0 +1,57 @@
+import pytest
+
+from varejo_facil import ClienteVarejoFacil, obter_custos
+
+CAMINHO_PRECOS = "/api/v1/produto/produtos/123456/precos"
+
+
+def chamadas(api, metodo, caminho):
+    return api.historico.count((metodo, caminho))
+
+
+def test_refaz_login_quando_o_token_expira(api, cliente):
+    api.expirar_token()
+    r = cliente.get(CAMINHO_PRECOS)
+
+    assert r.status_code == 200
+    assert cliente.token == api.token
+    assert chamadas(api, "POST", "/api/auth") == 2
+    assert chamadas(api, "GET", CAMINHO_PRECOS) == 2
+
+
+def test_sem_credenciais_nao_tenta_login(api):
+    cliente = ClienteVarejoFacil(cabecalhos={"x-api-key": "chave"})
+    api.falhar(401, "GET", CAMINHO_PRECOS)
+
+    assert cliente.get(CAMINHO_PRECOS).status_code == 401
+    assert chamadas(api, "POST", "/api/auth") == 0
+
+
+def test_login_falho_devolve_o_401(api, cliente):
+    api.expirar_token()
+    api.falhar(403, "POST", "/api/auth")
+
+    assert cliente.get(CAMINHO_PRECOS).status_code == 401
+    assert cliente.token is None
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_repete_429_e_5xx(api, cliente, status):
+    api.falhar(status, "GET", CAMINHO_PRECOS)
+
+    assert obter_custos(123456, cliente, usar_cache=False)[0]["produtoId"] == 123456
+    assert chamadas(api, "GET", CAMINHO_PRECOS) == 2
+
+
+def test_repete_put(api, cliente):
+    api.falhar(503, "PUT", r"/api/v1/produto/precos/\d+")
+
+    assert cliente.put("/api/v1/produto/precos/1234561", {"precoVenda1": 9.9}).status_code == 200
+    assert chamadas(api, "PUT", "/api/v1/produto/precos/1234561") == 2
+
+
+def test_nao_repete_erro_do_cliente(api, cliente):
+    api.falhar(400, "GET", CAMINHO_PRECOS)
+
+    assert cliente.get(CAMINHO_PRECOS).status_code == 400
+    assert chamadas(api, "GET", CAMINHO_PRECOS) == 1
@@ -0,0 +1,362 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime as dt
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from codigo_barras import codigo_valido, gtin14, normalizar_codigo
+from metricas import METRICAS
+
+URL_BASE = os.environ.get("VAREJO_FACIL_URL", "https://lojasmimi.varejofacil.com")
+# (conexão, leitura) em segundos: uma chamada travada não prende mais a sessão
+TIMEOUT = (
+    float(os.environ.get("VAREJO_FACIL_TIMEOUT_CONEXAO", "5")),
+    float(os.environ.get("VAREJO_FACIL_TIMEOUT_LEITURA", "30")),
+)
+TENTATIVAS = int(os.environ.get("VAREJO_FACIL_TENTATIVAS", "3"))
+TAMANHO_POOL = int(os.environ.get("VAREJO_FACIL_POOL", "20"))
+LOJAS = [1, 2, 5]
+MAX_CONCORRENCIA_LOJAS = int(os.environ.get("VAREJO_FACIL_CONCORRENCIA_LOJAS", "4"))
+MAX_CONCORRENCIA_CONSULTAS = int(os.environ.get("VAREJO_FACIL_CONCORRENCIA_CONSULTAS", "8"))
+TTL_CACHE_IDS = int(os.environ.get("VAREJO_FACIL_TTL_IDS", "600"))
+TTL_CACHE_PRECOS = int(os.environ.get("VAREJO_FACIL_TTL_PRECOS", "60"))
+TAMANHO_CACHE = int(os.environ.get("VAREJO_FACIL_TAMANHO_CACHE", "5000"))
+
+
+# ========================= CONEXÃO =========================
+_sessao = None
+_trava_sessao = threading.Lock()
+
+
+def sessao():
+    """Sessão HTTP única do processo, com pool keep-alive e retentativas.
+
+    429 e 5xx são repetidos com backoff exponencial, respeitando o
+    ``Retry-After`` enviado pela API.
+    """
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            retry = Retry(
+                total=TENTATIVAS,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "PUT", "POST"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adaptador = HTTPAdapter(pool_connections=2, pool_maxsize=TAMANHO_POOL, max_retries=retry)
+            s = requests.Session()
+            s.mount("https://", adaptador)
+            s.mount("http://", adaptador)
+            _sessao = s
+        return _sessao
+
+
+class LimitadorTaxa:
+    """Espaça as chamadas para no máximo ``por_segundo`` requisições por segundo."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo
+        self._proximo = time.monotonic()
+        self._trava = threading.Lock()
+
+    def aguardar(self):
+        with self._trava:
+            agora = time.monotonic()
+            espera = self._proximo - agora
+            self._proximo = max(self._proximo, agora) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+
+def em_paralelo(func, itens, max_concorrencia):
+    """Aplica ``func`` a cada item em paralelo e devolve cada resultado assim que fica pronto.
+
+    No máximo ``max_concorrencia`` itens rodam ao mesmo tempo. Se quem
+    consome o gerador parar no meio (ex.: rerun do Streamlit), os itens
+    que ainda não começaram são descartados.
+    """
+    ex = ThreadPoolExecutor(max_workers=max_concorrencia)
+    try:
+        futuros = [ex.submit(func, item) for item in itens]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _rota(caminho):
+    """Caminho sem os ids, para agrupar as latências por endpoint."""
+    return re.sub(r"/\d+", "/{id}", caminho)
+
+
+class ClienteVarejoFacil:
+    """Acesso à API do Varejo Fácil por cima da sessão compartilhada.
+
+    Com usuário e senha, o login é refeito automaticamente quando a API
+    responde 401 (token expirado). Sem credenciais, envia só os
+    ``cabecalhos`` fixos (ex.: ``x-api-key`` da consulta pública).
+    """
+
+    def __init__(self, usuario=None, senha=None, cabecalhos=None):
+        self.usuario = usuario
+        self.senha = senha
+        self.cabecalhos = dict(cabecalhos or {})
+        self.token = None
+        self.limitador = None
+        self._trava = threading.Lock()
+
+    def com_limite(self, por_segundo):
+        """Cópia do cliente (mesmo token e credenciais) limitada em requisições/s."""
+        cliente = copy.copy(self)
+        cliente.limitador = LimitadorTaxa(por_segundo)
+        return cliente
+
+    def login(self):
+        METRICAS.contar("api.login")
+        r = sessao().post(f"{URL_BASE}/api/auth",
+                          headers={"Content-Type": "application/json"},
+                          data=json.dumps({"username": self.usuario, "password": self.senha}),
+                          timeout=TIMEOUT)
+        self.token = r.json().get("accessToken") if r.status_code == 200 else None
+        return self.token
+
+    def _cabecalhos(self, extras):
+        hdr = {**self.cabecalhos, **(extras or {})}
+        if self.token:
+            hdr["Authorization"] = self.token
+        return hdr
+
+    def _enviar(self, metodo, caminho, headers, **kwargs):
+        if self.limitador:
+            self.limitador.aguardar()
+        try:
+            with METRICAS.medir(f"api.{metodo} {_rota(caminho)}"):
+                r = sessao().request(metodo, URL_BASE + caminho, headers=self._cabecalhos(headers), **kwargs)
+        except requests.RequestException:
+            METRICAS.contar("api.erro_rede")
+            raise
+        METRICAS.contar(f"api.status.{r.status_code}")
+        return r
+
+    def requisitar(self, metodo, caminho, headers=None, **kwargs):
+        kwargs.setdefault("timeout", TIMEOUT)
+        token_usado = self.token
+        r = self._enviar(metodo, caminho, headers, **kwargs)
+        if r.status_code == 401 and self.usuario:
+            with self._trava:
+                # Outra thread pode já ter renovado o token
+                if self.token == token_usado:
+                    self.login()
+            if self.token:
+                r = self._enviar(metodo, caminho, headers, **kwargs)
+        return r
+
+    def get(self, caminho, **kwargs):
+        return self.requisitar("GET", caminho, **kwargs)
+
+    def put(self, caminho, dados, **kwargs):
+        return self.requisitar("PUT", caminho, headers={"Content-Type": "application/json"},
+                               data=json.dumps(dados), **kwargs)
+
+
+# ========================= CACHE DE CONSULTAS =========================
+class CacheTTL:
+    """Cache LRU limitado com expiração por tempo, compartilhado entre threads.
+
+    Conta acertos e faltas para mostrar quanto tráfego à API foi evitado.
+    """
+
+    def __init__(self, tamanho_max, ttl):
+        self.tamanho_max = tamanho_max
+        self.ttl = ttl
+        self.acertos = 0
+        self.faltas = 0
+        self._dados = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave):
+        """Retorna ``(achou, valor)``."""
+        with self._trava:
+            item = self._dados.get(chave)
+            if item is not None and item[0] > time.monotonic():
+                self._dados.move_to_end(chave)
+                self.acertos += 1
+                return True, item[1]
+            if item is not None:
+                del self._dados[chave]
+            self.faltas += 1
+            return False, None
+
+    def guardar(self, chave, valor):
+        with self._trava:
+            self._dados[chave] = (time.monotonic() + self.ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_max:
+                self._dados.popitem(last=False)
+
+    def invalidar(self, chave):
+        with self._trava:
+            self._dados.pop(chave, None)
+
+    def estatisticas(self):
+        with self._trava:
+            total = self.acertos + self.faltas
+            return {"itens": len(self._dados), "acertos": self.acertos, "faltas": self.faltas,
+                    "taxa_acerto": round(self.acertos / total, 3) if total else 0.0}
+
+
+# Um por processo: compartilhados por todas as sessões do Streamlit
+CACHE_IDS = CacheTTL(TAMANHO_CACHE, TTL_CACHE_IDS)        # código de barras → (id, descrição)
+CACHE_PRECOS = CacheTTL(TAMANHO_CACHE, TTL_CACHE_PRECOS)  # produtoId → preços/custos por loja
+
+
+def estatisticas_cache():
+    return {"ids": CACHE_IDS.estatisticas(), "precos": CACHE_PRECOS.estatisticas()}
+
+
+# ========================= PRODUTOS E PREÇOS =========================
+def login(u, p):
+    """Retorna um cliente autenticado, ou None se as credenciais forem inválidas."""
+    cliente = ClienteVarejoFacil(u, p)
+    return cliente if cliente.login() else None
+
+
+def formatar_cb(c):
+    return normalizar_codigo(c)
+
+
+def obter_id(cb, cliente):
+    """(id, descrição) do produto; códigos com dígito verificador inválido nem vão à API."""
+    cb = normalizar_codigo(cb)
+    if not codigo_valido(cb):
+        return None, None
+    achou, valor = CACHE_IDS.obter(cb)
+    if achou:
+        return valor
+    r = cliente.get(f"/api/v1/produto/produtos/consulta/{gtin14(cb)}")
+    if r.status_code == 200:
+        d = r.json()
+        valor = d.get("id"), d.get("descricao")
+        if valor[0]:
+            CACHE_IDS.guardar(cb, valor)
+        return valor
+    return None, None
+
+
+def obter_custos(pid, cliente, usar_cache=True):
+    """Preços e custos do produto por loja.
+
+    O cache pode estar até ``TTL_CACHE_PRECOS`` segundos atrasado e só é
+    invalidado neste processo: leituras que alimentam um PUT (o payload
+    devolve os outros campos de preço/custo) devem usar ``usar_cache=False``.
+    """
+    if usar_cache:
+        achou, valor = CACHE_PRECOS.obter(pid)
+        if achou:
+            return valor
+    r = cliente.get(f"/api/v1/produto/produtos/{pid}/precos")
+    if r.status_code == 200:
+        valor = r.json()
+        CACHE_PRECOS.guardar(pid, valor)
+        return valor
+
+
+def consultar_produto(cb, cliente, loja=1):
+    """Id, descrição, preço de venda e custo de um código de barras na ``loja``."""
+    res = {"CODIGO BARRA": cb, "ID": None, "DESCRICAO API": "", "PRECO VENDA": None, "CUSTO": None, "STATUS": ""}
+    if not codigo_valido(cb):
+        res["STATUS"] = "Código de barras inválido"
+        return res
+    try:
+        pid, desc = obter_id(cb, cliente)
+        if not pid:
+            res["STATUS"] = "Não encontrado na API"
+            return res
+        res.update({"ID": pid, "DESCRICAO API": desc or ""})
+        precos = obter_custos(pid, cliente)
+    except requests.RequestException as e:
+        res["STATUS"] = f"Erro de comunicação: {e}"
+        return res
+    p = next((i for i in precos or [] if i.get("lojaId") == loja), None)
+    if p:
+        res.update({"PRECO VENDA": p.get("precoVenda1"), "CUSTO": p.get("custoProduto"), "STATUS": "OK"})
+    else:
+        res["STATUS"] = "Sem preço para a loja"
+    return res
+
+
+def consultar_em_lote(codigos, cliente, max_concorrencia=MAX_CONCORRENCIA_CONSULTAS):
+    """Consulta vários códigos em paralelo, devolvendo cada resultado assim que chega."""
+    return em_paralelo(lambda cb: consultar_produto(cb, cliente), codigos, max_concorrencia)
+
+
+def _payload(c, novo, tipo, data):
+    if tipo == "Venda":
+        pld = {k: c.get(k) for k in ["id", "lojaId", "produtoId",
+                                     "precoVenda1", "custoProduto",
+                                     "precoMedioDeReposicao", "precoFiscalDeReposicao"]}
+        pld["dataUltimoReajustePreco1"] = data
+        pld["precoVenda1"] = novo
+        return f"/api/v1/produto/precos/{c['id']}", pld
+    # tipo == "Custo"
+    pld = {
+        "id": c["id"],
+        "lojaId": c["lojaId"],
+        "produtoId": c["produtoId"],
+        "custoReposicao": novo,
+        "custoMedio": novo,
+        "custoFiscal": novo
+    }
+    return f"/api/v1/produto/custos/{c['id']}", pld
+
+
+def _atualiza_loja(c, novo, tipo, data, cliente, registro=None):
+    if registro:
+        status = registro.aplicada(c["lojaId"])
+        if status is not None:
+            # Já gravada numa execução anterior deste job: não reenvia
+            return {"lojaId": c["lojaId"], "ok": True, "status": status, "erro": ""}
+        id_escrita = registro.enviando(c.get("produtoId"), c["lojaId"], tipo, novo)
+
+    caminho, pld = _payload(c, novo, tipo, data)
+    try:
+        r = cliente.put(caminho, pld)
+    except requests.RequestException as e:
+        res = {"lojaId": c["lojaId"], "ok": False, "status": None, "erro": str(e)}
+    else:
+        ok = r.status_code == 200
+        res = {"lojaId": c["lojaId"], "ok": ok, "status": r.status_code, "erro": "" if ok else r.text[:200]}
+
+    if registro:
+        registro.resposta(id_escrita, res["ok"], res["status"], res["erro"])
+    return res
+
+
+def atualiza(custos, novo, tipo, cliente, max_concorrencia=MAX_CONCORRENCIA_LOJAS, registro=None):
+    """Envia a atualização de cada loja em paralelo (no máximo ``max_concorrencia``).
+
+    Retorna um dicionário por loja, na ordem de ``custos``, com ``lojaId``,
+    ``ok``, ``status`` (código HTTP, ou None em falha de rede) e ``erro``.
+    Com ``registro`` (ver ``diario.RegistroItem``), cada PUT é gravado no
+    diário antes do envio e lojas já aplicadas no job são puladas.
+    """
+    data = dt.now().astimezone().isoformat()
+    alvos = [c for c in custos if c['lojaId'] in LOJAS]
+    if not alvos:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_concorrencia, len(alvos))) as ex:
+        resultados = list(ex.map(lambda c: _atualiza_loja(c, novo, tipo, data, cliente, registro), alvos))
+    if any(r["ok"] for r in resultados):
+        for pid in {c.get("produtoId") for c in alvos}:
+            CACHE_PRECOS.invalidar(pid)
+    return resultados